@@ -126,11 +126,18 @@ function Dashboard() {
 
     // Show live search results if active
     if (activeQuery) {
-      const { data } = await supabase
-        .from("courses")
-        .select("*")
-        .ilike("id", `%${activeQuery}%`)
-        .limit(50);
+      // Ranked search via RPC (see database/sql/course_search.sql), ilike on id as fallback
+      const ranked = await supabase.rpc("search_courses", {
+        query: activeQuery,
+        max_results: 50,
+      });
+      const { data } = ranked.error
+        ? await supabase
+            .from("courses")
+            .select("*")
+            .ilike("id", `%${activeQuery}%`)
+            .limit(50)
+        : ranked;
 
       if (data) setCourses(data as unknown as Course[]);
       setTotalPages(1); // No pagination for search
@@ -1,5 +1,13 @@
 import type { Assessment } from "./assessment";
 
+/**
+ * Prerequisite expression compiled by the scraper (scraper/prereq_expr.py):
+ * a course code, "equivalent", or ["and" | "or", ...children].
+ */
+export type PrerequisiteExpr =
+  | string
+  | ["and" | "or", ...PrerequisiteExpr[]];
+
 export type CourseRawData = {
   code: string;
   title: string;
@@ -9,6 +17,7 @@ export type CourseRawData = {
   assessments: Assessment[];
   prerequisites_text: string;
   prerequisites_list: string[];
+  prerequisites_expr?: PrerequisiteExpr | null;
   incompatible_list: string[];
 };
 
@@ -1,5 +1,6 @@
 import { supabase } from "../supabaseClient";
 import type { Course } from "../types/course";
+import { fetchCourseBundle } from "./bundles";
 
 export const api = {
   /**
@@ -17,6 +18,23 @@ export const api = {
     const from = (page - 1) * pageSize;
     const to = from + pageSize - 1;
 
+    if (search) {
+      // Ranked, index-backed search (database/sql/course_search.sql)
+      const { data, error } = await supabase.rpc("search_courses", {
+        query: search,
+        max_results: pageSize,
+        result_offset: from,
+      });
+      if (!error && data) {
+        const rows = data as unknown as (Course & { total_count: number })[];
+        return {
+          data: rows as Course[],
+          count: rows.length > 0 ? Number(rows[0].total_count) : 0,
+        };
+      }
+      console.warn("RPC search_courses failed, falling back to ilike:", error);
+    }
+
     let query = supabase
       .from("courses")
       .select("*", { count: "exact" })
@@ -42,6 +60,16 @@ export const api = {
    * Fetch a single course by id
    */
   async fetchCourse(id: string) {
+    // Static bundle first (CDN-cacheable), Supabase as fallback
+    const bundle = await fetchCourseBundle(id);
+    if (bundle) {
+      return {
+        id,
+        title: bundle.course.title,
+        raw_data: { ...bundle.course, assessments: bundle.assessments },
+      } as Course;
+    }
+
     const { data, error } = await supabase
       .from("courses")
       .select("*")
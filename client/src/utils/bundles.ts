@@ -0,0 +1,47 @@
+import type { CourseRawData } from "../types/course";
+
+/**
+ * Static course bundles built by scraper/static_bundles.py into public/data/bundles.
+ * Bundle file names are content-hashed (immutable cache); manifest.json maps
+ * course codes to the current files.
+ */
+const BUNDLE_ROOT = "/data/bundles";
+
+type BundleManifest = {
+  courses: Record<string, string>;
+};
+
+export type CourseBundle = {
+  course: CourseRawData;
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  assessments: any[];
+};
+
+let manifestPromise: Promise<BundleManifest | null> | null = null;
+
+function loadManifest(): Promise<BundleManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${BUNDLE_ROOT}/manifest.json`)
+      .then((res) => (res.ok ? (res.json() as Promise<BundleManifest>) : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+/**
+ * Static bundle of one course (a single cacheable GET), or null if no bundle was built for it.
+ */
+export async function fetchCourseBundle(
+  courseId: string
+): Promise<CourseBundle | null> {
+  const manifest = await loadManifest();
+  const file = manifest?.courses[courseId];
+  if (!file) return null;
+
+  try {
+    const res = await fetch(`${BUNDLE_ROOT}/${file}`);
+    return res.ok ? ((await res.json()) as CourseBundle) : null;
+  } catch {
+    return null;
+  }
+}
@@ -1,13 +1,40 @@
 import { supabase } from "../supabaseClient";
 import type { Course, Status } from "../types/course";
 import { sortCourseIds } from "./graphUtils";
+import { fetchCourseBundle } from "./bundles";
+import { canStillSatisfy } from "./prereqExpr";
 
 /**
  * Hàm nhận vào danh sách ID môn học gốc.
  * Trả về danh sách chứa các môn đó VÀ toàn bộ các môn tiên quyết của chúng.
+ *
+ * Dùng RPC `course_tree` (bao đóng tiên quyết tính sẵn lúc upload, xem
+ * database/sql/course_prerequisites.sql): cả cây chỉ tốn một truy vấn.
+ * Nếu RPC chưa có trên database thì quay về duyệt BFS từng tầng.
  */
 export async function fetchFullCourseTree(
   rootIds: string[]
+): Promise<Course[]> {
+  const { data, error } = await supabase.rpc("course_tree", {
+    root_ids: rootIds,
+  });
+
+  if (error || !data) {
+    console.warn("RPC course_tree lỗi, chuyển sang duyệt từng tầng:", error);
+    return fetchFullCourseTreeByLevel(rootIds);
+  }
+
+  const courses = data as unknown as Course[];
+  const coursesById = new Map(courses.map((course) => [course.id, course]));
+  const sortedIds = sortCourseIds(Array.from(coursesById.keys()));
+  return sortedIds.map((id) => coursesById.get(id)!);
+}
+
+/**
+ * Cách cũ: duyệt BFS, mỗi tầng tiên quyết là một truy vấn `in(id, ...)`.
+ */
+async function fetchFullCourseTreeByLevel(
+  rootIds: string[]
 ): Promise<Course[]> {
   // Map để lưu các môn đã tìm thấy (tránh trùng lặp)
   const allCoursesMap = new Map<string, Course>();
@@ -66,6 +93,7 @@ export async function fetchFullCourseTree(
  * Logic:
  * - Nếu user tự set trạng thái (Passed/Failed), tôn trọng nó.
  * - Nếu môn X có môn tiên quyết bị Failed hoặc Blocked, môn X sẽ bị Blocked (trừ khi user đã set Passed/Failed).
+ *   Khi có prerequisites_expr (AND/OR), X chỉ bị Blocked khi không còn nhánh OR nào thỏa được.
  * - Mặc định là Not Started.
  */
 export function getEffectiveStatusMap(
@@ -86,15 +114,20 @@ export function getEffectiveStatusMap(
     if (!courseObj) return userStatus;
 
     // Check prerequisites
-    const prerequisites = courseObj.raw_data.prerequisites_list || [];
-    let isBlocked = false;
-
-    for (const pid of prerequisites) {
+    const isUnavailable = (pid: string) => {
       const pStatus = getStatus(pid); // Recursion
-      if (pStatus === "Failed" || pStatus === "Blocked") {
-        isBlocked = true;
-        break;
-      }
+      return pStatus === "Failed" || pStatus === "Blocked";
+    };
+
+    let isBlocked = false;
+    const expr = courseObj.raw_data.prerequisites_expr;
+
+    if (expr) {
+      // With the AND/OR structure, only block when no alternative is left
+      isBlocked = !canStillSatisfy(expr, isUnavailable);
+    } else {
+      const prerequisites = courseObj.raw_data.prerequisites_list || [];
+      isBlocked = prerequisites.some(isUnavailable);
     }
 
     // If blocked, force Blocked.
@@ -117,6 +150,9 @@ export function getEffectiveStatusMap(
 export async function fetchCourseAssessments(
   courseId: string
 ): Promise<any[] | null> {
+  const bundle = await fetchCourseBundle(courseId);
+  if (bundle) return bundle.assessments;
+
   const { data, error } = await supabase
     .from("courses")
     .select("raw_data")
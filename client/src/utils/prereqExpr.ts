@@ -0,0 +1,34 @@
+import type { PrerequisiteExpr } from "../types/course";
+
+/**
+ * Biểu thức tiên quyết còn có thể thỏa mãn không, nếu mọi môn chưa
+ * Failed/Blocked đều coi như sẽ qua.
+ * Cùng quy tắc với scraper/prereq_expr.py (can_still_satisfy), được kiểm tra
+ * chéo trong scraper/tests/test_course_graph.py.
+ *
+ * "equivalent" là chưa biết (app không theo dõi được môn tương đương), nên nó
+ * không giữ cho một nhánh OR sống: "X or equivalent" bị Blocked khi X
+ * Failed/Blocked. Chỉ khi biểu thức không có môn cụ thể nào thì mới không chặn.
+ */
+export function canStillSatisfy(
+  expr: PrerequisiteExpr,
+  isUnavailable: (courseId: string) => boolean
+): boolean {
+  return satisfiability(expr, isUnavailable) !== false;
+}
+
+/** true / false, hoặc null nếu nhánh chỉ gồm "equivalent" (chưa biết). */
+function satisfiability(
+  expr: PrerequisiteExpr,
+  isUnavailable: (courseId: string) => boolean
+): boolean | null {
+  if (typeof expr === "string") {
+    return expr === "equivalent" ? null : !isUnavailable(expr);
+  }
+  const [op, ...children] = expr;
+  const known = children
+    .map((child) => satisfiability(child, isUnavailable))
+    .filter((result): result is boolean => result !== null);
+  if (known.length === 0) return null;
+  return op === "and" ? known.every(Boolean) : known.some(Boolean);
+}
@@ -0,0 +1,102 @@
+"""
+Applies the schema scripts in database/sql to Postgres over a direct connection.
+
+PostgREST cannot run DDL (extensions, indexes, functions), so this needs a
+connection string in DATABASE_URL (Supabase: Project Settings > Database >
+Connection string) and the optional `psycopg` (or `psycopg2`) package.
+Every script is idempotent, so applying them again is safe.
+
+Usage:
+    python apply_sql.py                      # every script in SQL_FILES
+    python apply_sql.py course_search.sql    # just the named scripts
+"""
+
+import argparse
+import os
+
+try:
+    import psycopg
+except ImportError:
+    try:
+        import psycopg2 as psycopg
+    except ImportError:
+        psycopg = None
+
+from dotenv import load_dotenv
+
+# Load .env from root directory (parent of database folder)
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql')
+
+# Applied in this order; later scripts may depend on columns added by earlier ones
+SQL_FILES = (
+    'programs_name_unique.sql',
+    'courses_digest.sql',
+    'course_prerequisites.sql',
+    'course_search.sql',
+)
+
+
+def get_database_url():
+    """Returns the Postgres connection string from DATABASE_URL (or SUPABASE_DB_URL), or None."""
+    return os.getenv("DATABASE_URL") or os.getenv("SUPABASE_DB_URL")
+
+
+def _connect(dsn):
+    if psycopg is None:
+        raise RuntimeError("psycopg is not installed (pip install \"psycopg[binary]\")")
+    dsn = dsn or get_database_url()
+    if not dsn:
+        raise RuntimeError("DATABASE_URL is not set")
+    return psycopg.connect(dsn)
+
+
+def apply_sql_files(names=SQL_FILES, dsn=None):
+    """
+    Runs each script in its own transaction, in the given order.
+
+    Raises:
+        RuntimeError if psycopg or the connection string is missing;
+        the driver's error if a script fails (that script is rolled back)
+    """
+    conn = _connect(dsn)
+    try:
+        for name in names:
+            with open(os.path.join(SQL_DIR, name), 'r', encoding='utf-8') as f:
+                script = f.read()
+            with conn.cursor() as cur:
+                cur.execute(script)
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def analyze(tables=('public.courses',), dsn=None):
+    """Refreshes planner statistics after a bulk upload, so new rows are searched through the indexes."""
+    conn = _connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            for table in tables:
+                cur.execute(f"ANALYZE {table}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database/sql schema scripts over DATABASE_URL")
+    parser.add_argument('files', nargs='*', default=list(SQL_FILES), help="Scripts in database/sql to apply")
+    args = parser.parse_args()
+
+    for name in args.files:
+        try:
+            apply_sql_files([name])
+        except RuntimeError as e:
+            print(f"❌ Error: {e}")
+            exit(1)
+        print(f"✅ Applied {name}")
+
+
+if __name__ == "__main__":
+    main()
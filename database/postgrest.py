@@ -0,0 +1,424 @@
+"""
+Minimal PostgREST (Supabase REST API) client for bulk writes.
+
+One POST with `on_conflict` and `Prefer: resolution=merge-duplicates` upserts a
+whole batch of rows, instead of one PATCH per row.  ConcurrentUploader streams
+rows into batches capped by payload size and keeps several of them in flight,
+retrying failed batches, so large uploads are bound by bandwidth rather than
+round trips.
+"""
+
+import concurrent.futures
+import json
+import os
+import sys
+import threading
+
+import requests
+from dotenv import load_dotenv
+
+# Share the scraper's retry policy (backoff, retry budget, status classification)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraper'))
+from retry import RetryPolicy, classify_exception, classify_status
+
+# Load .env from root directory (parent of database folder)
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_TIMEOUT = 60
+# Upper bound on one request body; PostgREST/Supabase rejects very large payloads
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_MAX_IN_FLIGHT = 4
+# Values per `in.(...)` filter for bulk_update; they travel in the URL, so fewer than a body batch
+DEFAULT_FILTER_BATCH_SIZE = 100
+
+
+def get_credentials():
+    """
+    Returns (REST API base URL, key) from the environment.
+
+    Normally that is SUPABASE_URL + /rest/v1 with the service role key preferred.
+    Setting POSTGREST_URL (and optionally POSTGREST_KEY, a JWT) points every
+    script at a plain PostgREST server instead, e.g. a local stand-in for testing.
+
+    Exits with an error message if the URL or Supabase key is missing.
+    """
+    postgrest_url = os.getenv("POSTGREST_URL")
+    if postgrest_url:
+        return postgrest_url.rstrip("/"), os.getenv("POSTGREST_KEY", "")
+
+    url = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
+    if not url or not key:
+        print("❌ Error: Missing SUPABASE_URL or SUPABASE_KEY/SUPABASE_SERVICE_ROLE_KEY in .env file")
+        exit(1)
+    return f"{url.rstrip('/')}/rest/v1", key
+
+
+def get_service_credentials():
+    """
+    Returns (REST API base URL, service role key) for privileged calls, or None.
+
+    Functions such as replace_course_prerequisites are not executable with the
+    anon key, so this never falls back to it.  With POSTGREST_URL set,
+    POSTGREST_KEY is used as is.
+    """
+    postgrest_url = os.getenv("POSTGREST_URL")
+    if postgrest_url:
+        return postgrest_url.rstrip("/"), os.getenv("POSTGREST_KEY", "")
+
+    url = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        return None
+    return f"{url.rstrip('/')}/rest/v1", key
+
+
+def _headers(key, prefer=None):
+    headers = {"Content-Type": "application/json"}
+    if prefer:
+        headers["Prefer"] = prefer
+    if key:
+        headers["apikey"] = key
+        headers["Authorization"] = f"Bearer {key}"
+    return headers
+
+
+def bulk_upsert(table, rows, on_conflict, batch_size=DEFAULT_BATCH_SIZE, url=None, key=None, session=None):
+    """
+    Upserts rows into a table in batches of `batch_size`.
+
+    Rows that match an existing row on the `on_conflict` column(s) update only
+    the columns they carry; other rows are inserted.  The conflict columns need
+    a unique constraint (see database/sql/).
+
+    Args:
+        table: Table name
+        rows: List of dicts; all rows should have the same keys
+        on_conflict: Comma-separated unique column(s) identifying a row
+        batch_size: Rows per request
+        url, key: REST API base URL and key (default: get_credentials())
+        session: Optional requests.Session to reuse a connection
+
+    Returns:
+        Tuple of (rows written, list of (batch start index, error message))
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    session = session or requests.Session()
+
+    headers = _headers(key, "resolution=merge-duplicates,return=minimal")
+    columns = ",".join(rows[0].keys()) if rows else ""
+    endpoint = f"{url}/{table}"
+
+    written = 0
+    errors = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        try:
+            response = session.post(endpoint, params={"on_conflict": on_conflict, "columns": columns},
+                                    json=batch, headers=headers, timeout=DEFAULT_TIMEOUT)
+            if response.status_code in (200, 201, 204):
+                written += len(batch)
+            else:
+                errors.append((start, f"{response.status_code}: {response.text[:200]}"))
+        except requests.exceptions.RequestException as e:
+            errors.append((start, str(e)))
+
+    return written, errors
+
+
+def _quote_filter_value(value):
+    """
+    Quotes one value of an `in.(...)` filter by PostgREST's rules.
+
+    Strings are double-quoted with `\\` and `"` backslash-escaped, so commas,
+    parentheses and non-ASCII characters in a value (e.g. a program name) reach
+    the database unchanged.
+    """
+    if not isinstance(value, str):
+        return str(value)
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def bulk_delete(table, column, values, batch_size=DEFAULT_BATCH_SIZE, url=None, key=None, session=None):
+    """
+    Deletes rows whose `column` is in `values`, `batch_size` values per request.
+
+    Returns:
+        Tuple of (values sent, list of (batch start index, error message))
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    session = session or requests.Session()
+    headers = _headers(key, "return=minimal")
+
+    deleted = 0
+    errors = []
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        in_list = ",".join(_quote_filter_value(value) for value in batch)
+        try:
+            response = session.delete(f"{url}/{table}", params={column: f"in.({in_list})"},
+                                      headers=headers, timeout=DEFAULT_TIMEOUT)
+            if response.status_code in (200, 204):
+                deleted += len(batch)
+            else:
+                errors.append((start, f"{response.status_code}: {response.text[:200]}"))
+        except requests.exceptions.RequestException as e:
+            errors.append((start, str(e)))
+
+    return deleted, errors
+
+
+def bulk_update(table, column, values, changes, batch_size=DEFAULT_FILTER_BATCH_SIZE, url=None, key=None,
+                session=None):
+    """
+    Sets `changes` on the existing rows whose `column` is in `values`, `batch_size` values per PATCH.
+
+    Unlike bulk_upsert this never inserts, so rows carrying only a few columns
+    cannot create partial rows.
+
+    Returns:
+        Tuple of (values sent, list of (batch start index, error message))
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    session = session or requests.Session()
+    headers = _headers(key, "return=minimal")
+
+    updated = 0
+    errors = []
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        in_list = ",".join(_quote_filter_value(value) for value in batch)
+        try:
+            response = session.patch(f"{url}/{table}", params={column: f"in.({in_list})"},
+                                     json=changes, headers=headers, timeout=DEFAULT_TIMEOUT)
+            if response.status_code in (200, 204):
+                updated += len(batch)
+            else:
+                errors.append((start, f"{response.status_code}: {response.text[:200]}"))
+        except requests.exceptions.RequestException as e:
+            errors.append((start, str(e)))
+
+    return updated, errors
+
+
+def count_rows(table, url=None, key=None):
+    """Exact row count of a table (from the Content-Range of a HEAD request), or None on error."""
+    if url is None or key is None:
+        url, key = get_credentials()
+    try:
+        response = requests.head(f"{url}/{table}", params={"select": "*"},
+                                 headers=_headers(key, "count=exact"), timeout=DEFAULT_TIMEOUT)
+        return int(response.headers["Content-Range"].rsplit("/", 1)[1])
+    except (requests.exceptions.RequestException, KeyError, ValueError):
+        return None
+
+
+def has_column(table, column, url=None, key=None):
+    """
+    True if `table` has `column` (PostgREST answers 400 when selecting an unknown column).
+
+    Raises:
+        requests.HTTPError for any other error, so a connection problem is not read as "no column"
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    response = requests.get(f"{url}/{table}", params={"select": column, "limit": 1},
+                            headers=_headers(key), timeout=DEFAULT_TIMEOUT)
+    if response.status_code == 400:
+        return False
+    response.raise_for_status()
+    return True
+
+
+class ConcurrentUploader:
+    """
+    Upserts a stream of rows with several size-capped batches in flight.
+
+    Rows are JSON-encoded once as they are added and packed into a batch until
+    it would exceed `max_batch_bytes` or `max_batch_rows`.  Full batches are sent
+    on a thread pool; `add` blocks while `max_in_flight` batches are
+    outstanding, so memory stays bounded however large the input is.  Failed
+    batches are retried with backoff (RetryPolicy); batches that still fail, or
+    whose send raised unexpectedly, are recorded in `failed` for the report.
+
+    Usage:
+        with ConcurrentUploader("courses", "id") as uploader:
+            for row in rows:
+                uploader.add(row, label=row["id"])
+        print(uploader.written, uploader.failed)
+
+    Args:
+        table: Table name
+        on_conflict: Unique column(s) identifying a row
+        max_in_flight: Batches sent concurrently
+        max_batch_bytes: Max request body size
+        max_batch_rows: Max rows per batch
+        retry: RetryPolicy for failed batches
+        url, key: REST API base URL and key (default: get_credentials())
+    """
+
+    def __init__(self, table, on_conflict, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 max_batch_bytes=DEFAULT_MAX_BATCH_BYTES, max_batch_rows=DEFAULT_BATCH_SIZE,
+                 retry=None, url=None, key=None):
+        if url is None or key is None:
+            url, key = get_credentials()
+        self.endpoint = f"{url}/{table}"
+        self.on_conflict = on_conflict
+        self.max_in_flight = max_in_flight
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_rows = max_batch_rows
+        self.retry = retry or RetryPolicy(max_attempts=5, base_delay=1.0)
+        self.headers = _headers(key, "resolution=merge-duplicates,return=minimal")
+
+        self.rows_added = 0
+        self.written = 0
+        self.batches_sent = 0
+        self.retries = 0
+        self.failed = []        # (labels of the rows in the batch, error message)
+
+        self._columns = None
+        self._parts = []
+        self._labels = []
+        self._size = 2          # the enclosing [ ]
+        self._pending = {}      # future -> labels of the batch it sends
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        done, _ = concurrent.futures.wait(self._pending)
+        self._collect(done)
+        self._executor.shutdown()
+        return False
+
+    def add(self, row, label=None):
+        """Queues one row; `label` (e.g. its id) names it in the failure report."""
+        if self._columns is None:
+            self._columns = ",".join(row.keys())
+        encoded = json.dumps(row, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        if self._parts and (self._size + len(encoded) + 1 > self.max_batch_bytes
+                            or len(self._parts) >= self.max_batch_rows):
+            self.flush()
+
+        self._parts.append(encoded)
+        self._labels.append(label)
+        self._size += len(encoded) + 1
+        self.rows_added += 1
+
+    def flush(self):
+        """Sends the current partial batch, waiting for a free slot first."""
+        if not self._parts:
+            return
+        body = b"[" + b",".join(self._parts) + b"]"
+        labels = self._labels
+        self._parts, self._labels, self._size = [], [], 2
+
+        while len(self._pending) >= self.max_in_flight:
+            done, _ = concurrent.futures.wait(self._pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            self._collect(done)
+        self._pending[self._executor.submit(self._send, body, labels)] = labels
+
+    def _collect(self, done):
+        """Forgets finished batches, recording any whose send raised as failed."""
+        for future in done:
+            labels = self._pending.pop(future)
+            error = future.exception()
+            if error is not None:
+                with self._lock:
+                    self.failed.append((labels, f"{type(error).__name__}: {error}"))
+                    self.batches_sent += 1
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, body, labels):
+        self.retry.budget.record_request()
+        params = {"on_conflict": self.on_conflict, "columns": self._columns}
+        attempt = 1
+        while True:
+            retry_after = None
+            try:
+                response = self._session().post(self.endpoint, params=params, data=body,
+                                                headers=self.headers, timeout=DEFAULT_TIMEOUT)
+                if response.status_code in (200, 201, 204):
+                    with self._lock:
+                        self.written += len(labels)
+                        self.batches_sent += 1
+                    return
+                kind = classify_status(response.status_code)
+                error = f"{response.status_code}: {response.text[:200]}"
+                retry_after = response.headers.get("Retry-After")
+            except requests.exceptions.RequestException as e:
+                kind = classify_exception(e)
+                error = str(e)
+
+            if not self.retry.should_retry(attempt, kind):
+                with self._lock:
+                    self.failed.append((labels, error))
+                    self.batches_sent += 1
+                return
+            with self._lock:
+                self.retries += 1
+            self.retry.sleep(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None)
+            attempt += 1
+
+
+def fetch_column_map(table, key_column, value_column, page_size=1000, url=None, key=None):
+    """
+    Reads {key_column: value_column} for every row of a table.
+
+    Pages through the table in key order (keyset pagination, `key_column=gt.<last>`),
+    so each page is an indexed range scan whatever the table size.
+
+    Raises:
+        requests.HTTPError if a page cannot be fetched
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    headers = _headers(key)
+    session = requests.Session()
+
+    values = {}
+    last = None
+    while True:
+        params = {"select": f"{key_column},{value_column}", "order": f"{key_column}.asc", "limit": page_size}
+        if last is not None:
+            params[key_column] = f"gt.{last}"
+        response = session.get(f"{url}/{table}", params=params, headers=headers, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        page = response.json()
+        for row in page:
+            values[row[key_column]] = row[value_column]
+        # Only an empty page ends the scan: the server may cap pages below page_size
+        if not page:
+            return values
+        last = page[-1][key_column]
+
+
+def call_rpc(function, args, url=None, key=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Calls a Postgres function exposed by PostgREST (POST /rpc/<function>).
+
+    Raises:
+        requests.HTTPError if the call fails
+    """
+    if url is None or key is None:
+        url, key = get_credentials()
+    body = json.dumps(args, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    response = requests.post(f"{url}/rpc/{function}", data=body, headers=_headers(key), timeout=timeout)
+    response.raise_for_status()
+    return response.json() if response.content else None
@@ -0,0 +1,98 @@
+-- Normalised prerequisite graph, rebuilt from the catalogue on every upload
+-- (database/upload_courses.py -> replace_course_prerequisites).
+--
+--   course_prerequisites   one row per (course, direct prerequisite) edge
+--   course_prereq_closure  every direct or indirect prerequisite of a course,
+--                          with the length of the shortest chain (1 = direct)
+--
+-- course_tree(root_ids) returns the given courses plus all their prerequisites
+-- in one indexed query, replacing a client-side walk of one query per level.
+
+CREATE TABLE IF NOT EXISTS public.course_prerequisites (
+    course_id text NOT NULL,
+    prereq_id text NOT NULL,
+    PRIMARY KEY (course_id, prereq_id)
+);
+CREATE INDEX IF NOT EXISTS course_prerequisites_prereq_idx ON public.course_prerequisites (prereq_id);
+
+CREATE TABLE IF NOT EXISTS public.course_prereq_closure (
+    course_id   text NOT NULL,
+    ancestor_id text NOT NULL,
+    depth       integer NOT NULL,
+    PRIMARY KEY (course_id, ancestor_id)
+);
+CREATE INDEX IF NOT EXISTS course_prereq_closure_ancestor_idx ON public.course_prereq_closure (ancestor_id);
+
+-- Replaces both tables with the given rows in one transaction, touching only
+-- rows that actually changed, so readers never see a half-updated closure.
+--   edges:   [{"course_id": ..., "prereq_id": ...}, ...]
+--   closure: [{"course_id": ..., "ancestor_id": ..., "depth": ...}, ...]
+CREATE OR REPLACE FUNCTION public.replace_course_prerequisites(edges jsonb, closure jsonb)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM public.course_prerequisites p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM jsonb_to_recordset(edges) AS n(course_id text, prereq_id text)
+        WHERE n.course_id = p.course_id AND n.prereq_id = p.prereq_id
+    );
+    INSERT INTO public.course_prerequisites (course_id, prereq_id)
+    SELECT course_id, prereq_id FROM jsonb_to_recordset(edges) AS n(course_id text, prereq_id text)
+    ON CONFLICT DO NOTHING;
+
+    DELETE FROM public.course_prereq_closure c
+    WHERE NOT EXISTS (
+        SELECT 1 FROM jsonb_to_recordset(closure) AS n(course_id text, ancestor_id text, depth integer)
+        WHERE n.course_id = c.course_id AND n.ancestor_id = c.ancestor_id
+    );
+    INSERT INTO public.course_prereq_closure (course_id, ancestor_id, depth)
+    SELECT course_id, ancestor_id, depth
+    FROM jsonb_to_recordset(closure) AS n(course_id text, ancestor_id text, depth integer)
+    ON CONFLICT (course_id, ancestor_id) DO UPDATE SET depth = excluded.depth
+    WHERE public.course_prereq_closure.depth <> excluded.depth;
+END;
+$$;
+
+-- The given courses and every course in their prerequisite closure.
+CREATE OR REPLACE FUNCTION public.course_tree(root_ids text[])
+RETURNS SETOF public.courses
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.*
+    FROM public.courses c
+    WHERE c.id = ANY (root_ids)
+       OR c.id IN (
+           SELECT ancestor_id FROM public.course_prereq_closure WHERE course_id = ANY (root_ids)
+       );
+$$;
+
+-- The browser (anon key) may only read the graph.  Without an INSERT/UPDATE/DELETE
+-- policy, RLS denies writes to every role except those that bypass it (Supabase's
+-- service_role), and only the service role may run replace_course_prerequisites.
+ALTER TABLE public.course_prerequisites ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.course_prereq_closure ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS course_prerequisites_read ON public.course_prerequisites;
+CREATE POLICY course_prerequisites_read ON public.course_prerequisites FOR SELECT USING (true);
+DROP POLICY IF EXISTS course_prereq_closure_read ON public.course_prereq_closure;
+CREATE POLICY course_prereq_closure_read ON public.course_prereq_closure FOR SELECT USING (true);
+
+REVOKE EXECUTE ON FUNCTION public.replace_course_prerequisites(jsonb, jsonb) FROM PUBLIC;
+-- Supabase grants EXECUTE on new functions to its API roles directly; they only exist there
+DO $$
+DECLARE
+    api_role text;
+BEGIN
+    FOREACH api_role IN ARRAY ARRAY['anon', 'authenticated'] LOOP
+        IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = api_role) THEN
+            EXECUTE format('REVOKE EXECUTE ON FUNCTION public.replace_course_prerequisites(jsonb, jsonb) FROM %I',
+                           api_role);
+        END IF;
+    END LOOP;
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        GRANT EXECUTE ON FUNCTION public.replace_course_prerequisites(jsonb, jsonb) TO service_role;
+    END IF;
+END
+$$;
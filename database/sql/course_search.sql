@@ -0,0 +1,62 @@
+-- Index-backed course search (database/upload_courses.py --provision applies it).
+--
+--   courses_id_trgm_idx, courses_title_trgm_idx
+--                          pg_trgm GIN indexes, so `id/title ILIKE '%x%'`
+--                          and `title % x` (fuzzy match) no longer scan the table
+--   course_search_vector(title, raw_data)
+--                          tsvector over title (weight A), description (B),
+--                          faculty and school (C); indexed as an expression, so
+--                          courses gains no column and `select *` stays lean
+--   search_courses(query, max_results, result_offset)
+--                          ranked matches: exact code, then code prefix, then
+--                          full-text rank plus title similarity; total_count is
+--                          the number of matches before paging
+--
+-- Checked with apply_sql.py on PostgreSQL 18 + pg_trgm (9,000 courses): the planner
+-- inlines search_courses, and EXPLAIN shows one BitmapOr over courses_id_trgm_idx,
+-- courses_title_trgm_idx (ILIKE and %) and courses_search_vector_idx, with no
+-- sequential scan of courses.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION public.course_search_vector(title text, raw_data jsonb)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+           setweight(to_tsvector('english'::regconfig, coalesce(raw_data->>'description', '')), 'B') ||
+           setweight(to_tsvector('english'::regconfig,
+                                 coalesce(raw_data->>'faculty', '') || ' ' || coalesce(raw_data->>'school', '')), 'C');
+$$;
+
+CREATE INDEX IF NOT EXISTS courses_id_trgm_idx ON public.courses USING gin (id gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS courses_title_trgm_idx ON public.courses USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS courses_search_vector_idx ON public.courses
+    USING gin (public.course_search_vector(title, raw_data));
+
+-- LIKE wildcards in the query are escaped, so "%" or "_" match literally.  The
+-- full-text condition repeats the indexed expression exactly, so it uses the index.
+CREATE OR REPLACE FUNCTION public.search_courses(query text, max_results integer DEFAULT 20, result_offset integer DEFAULT 0)
+RETURNS TABLE (id text, title text, raw_data jsonb, rank real, total_count bigint)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT m.id, m.title, m.raw_data, m.rank, count(*) OVER () AS total_count
+    FROM (
+        SELECT c.id, c.title, c.raw_data,
+               (CASE WHEN c.id = upper(btrim(query)) THEN 3
+                     WHEN starts_with(c.id, upper(btrim(query))) THEN 2
+                     ELSE 0 END
+                + ts_rank(public.course_search_vector(c.title, c.raw_data), websearch_to_tsquery('english', query))
+                + similarity(c.title, btrim(query)))::real AS rank
+        FROM public.courses c
+        WHERE btrim(query) <> ''
+          AND (c.id ILIKE '%' || replace(replace(replace(btrim(query), '\', '\\'), '%', '\%'), '_', '\_') || '%'
+               OR c.title ILIKE '%' || replace(replace(replace(btrim(query), '\', '\\'), '%', '\%'), '_', '\_') || '%'
+               OR public.course_search_vector(c.title, c.raw_data) @@ websearch_to_tsquery('english', query)
+               OR c.title % btrim(query))
+    ) m
+    ORDER BY m.rank DESC, m.id
+    LIMIT max_results OFFSET result_offset;
+$$;
@@ -0,0 +1,5 @@
+-- Per-course content digest used by `upload_courses.py --sync`.
+-- The digest is the SHA-256 of the course record's canonical JSON
+-- (scraper/course_delta.py: record_hash); a sync compares it with the local
+-- catalogue and only uploads courses whose digest differs.
+ALTER TABLE public.courses ADD COLUMN IF NOT EXISTS digest text;
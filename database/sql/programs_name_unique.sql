@@ -0,0 +1,12 @@
+-- Program updates resolve each program name to its id (update_faculty.py,
+-- update_programs_data.py), which needs program names to be unique.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'programs_name_key' AND conrelid = 'public.programs'::regclass
+    ) THEN
+        ALTER TABLE public.programs ADD CONSTRAINT programs_name_key UNIQUE (name);
+    END IF;
+END
+$$;
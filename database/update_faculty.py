@@ -1,44 +1,17 @@
+import argparse
 import json
 import os
-import requests
-import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
 
-# Supabase Credentials
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+from postgrest import DEFAULT_FILTER_BATCH_SIZE, bulk_update, fetch_column_map, get_credentials
 
-headers = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json",
-    "Prefer": "return=minimal"
-}
+def main(batch_size=DEFAULT_FILTER_BATCH_SIZE):
+    """
+    Sets each program's faculty from programs2.json, matched to rows by program name.
 
-def update_single_program(item):
-    program_name, department = item
-    
-    # URL encode the program name
-    encoded_name = urllib.parse.quote(program_name)
-    url = f"{SUPABASE_URL}/rest/v1/programs?name=eq.{encoded_name}"
-    
-    payload = {
-        "faculty": department
-    }
-    
-    try:
-        response = requests.patch(url, json=payload, headers=headers)
-        if response.status_code in [200, 204]:
-            print(f"✅ Updated: {program_name} -> {department}")
-            return True
-        else:
-            print(f"❌ Failed ({response.status_code}): {program_name}")
-            return False
-    except Exception as e:
-        print(f"⚠️ Error {program_name}: {e}")
-        return False
-
-def main():
+    Names are resolved to program ids first, and only existing programs are
+    updated (one PATCH per faculty and batch of `batch_size` ids); names
+    missing from the table are reported and skipped, never inserted.
+    """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(script_dir, '..', 'data', 'programs2.json')
     
@@ -50,18 +23,34 @@ def main():
         data = json.load(f)
         
     print(f"🚀 Starting update for {len(data)} programs...")
-    
-    items = []
+
+    url, key = get_credentials()
+    existing = fetch_column_map("programs", "name", "id", url=url, key=key)
+
+    ids_by_faculty = {}
+    missing = []
     for program_name, info in data.items():
         department = info.get('department')
-        if department:
-            items.append((program_name, department))
-            
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(update_single_program, items))
-        
-    success_count = sum(results)
-    print(f"\n🎉 Finished! Updated {success_count}/{len(items)} programs.")
+        if not department:
+            continue
+        if program_name in existing:
+            ids_by_faculty.setdefault(department, []).append(existing[program_name])
+        else:
+            missing.append(program_name)
+
+    updated = 0
+    for department, ids in ids_by_faculty.items():
+        sent, errors = bulk_update("programs", "id", ids, {"faculty": department},
+                                   batch_size=batch_size, url=url, key=key)
+        updated += sent
+        for start, message in errors:
+            print(f"❌ Failed batch of {department} starting at program {start}: {message}")
+
+    if missing:
+        print(f"⚠️ Skipped {len(missing)} programs not in the programs table (e.g. {missing[0]})")
+    print(f"\n🎉 Finished! Updated {updated}/{updated + len(missing)} programs.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Set program faculties in Supabase from programs2.json")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_FILTER_BATCH_SIZE, help="Programs per request")
+    main(parser.parse_args().batch_size)
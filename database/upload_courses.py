@@ -1,79 +1,280 @@
 import json
 import os
-from supabase import create_client, Client
+import sys
+import time
 from tqdm import tqdm
 
+# Dùng chung bộ đọc JSON Lines với scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraper'))
+from jsonl_io import find_master_courses, iter_records
+from course_delta import (DEFAULT_CHANGES_PATH, REMOVED, clear_changes, iter_changes, load_failed_codes,
+                          record_hash)
+from postgrest import (ConcurrentUploader, bulk_delete, call_rpc, count_rows, fetch_column_map, get_credentials,
+                       get_service_credentials, has_column)
+from prereq_closure import build_prerequisite_edges, transitive_closure
+from apply_sql import SQL_FILES, analyze, apply_sql_files
+
+# --delta: chỉ áp dụng change set (thêm/sửa/xóa) của lần crawl gần nhất thay vì upsert toàn bộ
+DELTA_MODE = '--delta' in sys.argv
+# --sync: so sánh digest của từng môn với cột `digest` trên Supabase, chỉ đẩy môn khác digest
+#         và xóa môn không còn trong catalogue (cần chạy database/sql/courses_digest.sql trước)
+SYNC_MODE = '--sync' in sys.argv
+# Không xóa quá tỉ lệ này của bảng trong một lần sync (trừ khi có --force-delete), phòng khi catalogue bị thiếu
+MAX_DELETE_FRACTION = 0.2
+FORCE_DELETE = '--force-delete' in sys.argv
+# --provision: chạy các script trong database/sql (pg_trgm, chỉ mục tìm kiếm, RPC search_courses, ...)
+#              qua DATABASE_URL trước khi upload, và ANALYZE bảng courses sau khi upload (cần psycopg)
+PROVISION_MODE = '--provision' in sys.argv
+
+# Số batch gửi song song và giới hạn kích thước mỗi batch (theo byte, vì raw_data dài ngắn rất khác nhau)
+MAX_IN_FLIGHT = 6
+MAX_BATCH_BYTES = 1024 * 1024
+MAX_BATCH_ROWS = 500
+
 # ======================================================
 # 1. CẤU HÌNH KẾT NỐI
 # ======================================================
-from dotenv import load_dotenv
+# Đọc SUPABASE_URL / SUPABASE_KEY từ file .env ở thư mục gốc (xem postgrest.py);
+# đặt POSTGREST_URL để chạy thử với một PostgREST cục bộ
+REST_URL, REST_KEY = get_credentials()
 
-# Load .env from root directory (parent of database folder)
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
-
-SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Lỗi: Không tìm thấy biến môi trường SUPABASE_URL hoặc SUPABASE_KEY trong file .env")
-    exit(1)
+if PROVISION_MODE:
+    print(f"🛠️ Đang áp dụng {len(SQL_FILES)} script SQL (chỉ mục tìm kiếm, đồ thị tiên quyết, ...)...")
+    try:
+        apply_sql_files()
+    except Exception as e:
+        print(f"❌ Lỗi khi áp dụng script SQL: {e}")
+        sys.exit(1)
 
+# Chỉ gửi cột digest khi bảng đã có cột này (database/sql/courses_digest.sql), nếu không mọi batch đều lỗi 400.
+# Có cột thì luôn gửi, để digest trên Supabase luôn khớp với raw_data dù upload bằng chế độ nào.
 try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    HAS_DIGEST = has_column("courses", "digest", url=REST_URL, key=REST_KEY)
 except Exception as e:
-    print(f"❌ Lỗi kết nối Supabase: {e}")
-    exit(1)
+    print(f"❌ Lỗi: không kết nối được tới bảng courses: {e}")
+    sys.exit(1)
+if SYNC_MODE and not HAS_DIGEST:
+    print("❌ Lỗi: bảng courses chưa có cột digest, cần cho --sync.")
+    print("👉 Hãy chạy database/sql/courses_digest.sql (hoặc upload_courses.py --provision) trước.")
+    sys.exit(1)
 
 # ======================================================
 # 2. ĐỌC FILE JSON TỪ THƯ MỤC DATA
 # ======================================================
 # Đường dẫn lùi ra 1 cấp (..) rồi vào data
 script_dir = os.path.dirname(os.path.abspath(__file__))
-json_path = os.path.join(script_dir, '..', 'data', 'master_courses.json')
+data_dir = os.path.join(script_dir, '..', 'data')
+failed_path = os.path.join(data_dir, 'upload_failed_courses.json')
 
-try:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print(f"📖 Đã đọc thành công {len(data)} môn học từ file.")
-except FileNotFoundError:
-    print(f"❌ Lỗi: Không tìm thấy file tại '{json_path}'")
+def to_row(course):
+    # Tạo bản ghi theo đúng cột trong Database
+    row = {
+        "id": course["code"],             # Mã môn làm ID (VD: CSSE1001)
+        "title": course["title"],         # Tên môn
+        "raw_data": course,               # Toàn bộ dữ liệu JSON nhét vào đây
+    }
+    if HAS_DIGEST:
+        row["digest"] = record_hash(course)   # Digest nội dung, dùng cho --sync
+    return row
+
+def new_uploader():
+    return ConcurrentUploader("courses", "id", max_in_flight=MAX_IN_FLIGHT, max_batch_bytes=MAX_BATCH_BYTES,
+                              max_batch_rows=MAX_BATCH_ROWS, url=REST_URL, key=REST_KEY)
+
+def report(uploader, expected_codes, duration):
+    """In báo cáo đối chiếu: số môn đọc được, đã ghi, thất bại, và số dòng thực tế trên Supabase."""
+    failed_codes = sorted(code for labels, _ in uploader.failed for code in labels)
+
+    print("\n📊 BÁO CÁO ĐỐI CHIẾU")
+    print(f"   - Mã môn đã đọc:         {len(expected_codes)}")
+    print(f"   - Bản ghi cần gửi:       {uploader.rows_added}")
+    print(f"   - Bản ghi đã ghi:        {uploader.written} trong {uploader.batches_sent} batch ({duration:.1f}s)")
+    print(f"   - Số lần thử lại:        {uploader.retries}")
+    print(f"   - Bản ghi thất bại:      {len(failed_codes)} ({len(uploader.failed)} batch)")
+    for labels, error in uploader.failed[:5]:
+        print(f"     ⚠️ {labels[0]}..{labels[-1]}: {error}")
+
+    if failed_codes:
+        with open(failed_path, 'w', encoding='utf-8') as f:
+            json.dump(failed_codes, f, indent=4)
+        print(f"   💾 Đã lưu danh sách môn lỗi vào: {failed_path}")
+    elif os.path.exists(failed_path):
+        os.remove(failed_path)
+
+    return failed_codes
+
+def refresh_search_stats():
+    """Cập nhật thống kê của bảng courses (ANALYZE) để truy vấn tìm kiếm dùng đúng chỉ mục (chỉ khi --provision)."""
+    if not PROVISION_MODE:
+        return
+    try:
+        analyze()
+    except Exception as e:
+        print(f"⚠️ Lỗi khi ANALYZE bảng courses: {e}")
+
+def upload_prerequisite_graph(catalogue_path):
+    """
+    Dựng bảng cạnh course_prerequisites và bao đóng bắc cầu course_prereq_closure
+    từ catalogue, rồi thay thế cả hai trên Supabase trong một transaction
+    (cần chạy database/sql/course_prerequisites.sql trước).
+    """
+    if not catalogue_path:
+        return True
+
+    edges = build_prerequisite_edges(iter_records(catalogue_path))
+    edge_rows = [{"course_id": code, "prereq_id": prereq} for code, prereqs in edges.items() for prereq in prereqs]
+    closure_rows = [{"course_id": code, "ancestor_id": ancestor, "depth": depth}
+                    for code, ancestor, depth in transitive_closure(edges)]
+
+    # Chỉ service role được gọi replace_course_prerequisites (anon key của trình duyệt thì không)
+    service = get_service_credentials()
+    if service is None:
+        print("⚠️ Thiếu SUPABASE_SERVICE_ROLE_KEY, không thể cập nhật đồ thị tiên quyết.")
+        return False
+    service_url, service_key = service
+
+    print(f"🌳 Cập nhật đồ thị tiên quyết: {len(edge_rows)} cạnh, {len(closure_rows)} dòng bao đóng...")
+    try:
+        call_rpc("replace_course_prerequisites", {"edges": edge_rows, "closure": closure_rows},
+                 url=service_url, key=service_key, timeout=300)
+        return True
+    except Exception as e:
+        print(f"⚠️ Lỗi cập nhật đồ thị tiên quyết: {e}")
+        return False
+
+# ======================================================
+# 2a. CHẾ ĐỘ DELTA: CHỈ ĐẨY NHỮNG MÔN ĐÃ THAY ĐỔI
+# ======================================================
+if DELTA_MODE:
+    if not os.path.exists(DEFAULT_CHANGES_PATH):
+        print("✅ Không có thay đổi nào cần upload (không tìm thấy change set).")
+        sys.exit(0)
+
+    print(f"📖 Đọc change set từ file: {DEFAULT_CHANGES_PATH}")
+    removed = []
+    changed_codes = set()
+    start = time.time()
+
+    with new_uploader() as uploader:
+        for change in tqdm(iter_changes(DEFAULT_CHANGES_PATH), desc="Uploading changes"):
+            if change["change"] == REMOVED:
+                removed.append(change["code"])
+                continue
+            changed_codes.add(change["code"])
+            uploader.add(to_row(change["record"]), label=change["code"])
+
+    failed_codes = report(uploader, changed_codes, time.time() - start)
+
+    # Xóa các môn không còn trong catalogue
+    _, delete_errors = bulk_delete("courses", "id", removed, url=REST_URL, key=REST_KEY)
+    for _, message in delete_errors:
+        print(f"⚠️ Lỗi khi xóa: {message}")
+
+    graph_ok = upload_prerequisite_graph(find_master_courses(data_dir)) if changed_codes or removed else True
+
+    if failed_codes or delete_errors or not graph_ok:
+        # Giữ lại change set để lần chạy sau thử lại
+        print("⚠️ Có batch lỗi, giữ lại change set để chạy lại.")
+        sys.exit(1)
+
+    clear_changes(DEFAULT_CHANGES_PATH)
+    refresh_search_stats()
+    print(f"\n✅ HOÀN TẤT! Đã áp dụng change set ({len(removed)} môn bị xóa).")
+    sys.exit(0)
+
+# Ưu tiên master_courses.jsonl.gz / .jsonl, sau đó mới đến master_courses.json cũ
+json_path = find_master_courses(data_dir)
+
+# ======================================================
+# 2b. CHẾ ĐỘ SYNC: SO SÁNH DIGEST VỚI SUPABASE
+# ======================================================
+if SYNC_MODE and json_path:
+    print("🔎 Đang lấy digest của các môn trên Supabase...")
+    remote_digests = fetch_column_map("courses", "id", "digest", url=REST_URL, key=REST_KEY)
+    print(f"   {len(remote_digests)} môn trên Supabase")
+
+    local_codes = set()
+    unchanged = 0
+    start = time.time()
+
+    with new_uploader() as uploader:
+        for course in tqdm(iter_records(json_path), desc="Syncing"):
+            local_codes.add(course["code"])
+            row = to_row(course)
+            if remote_digests.get(row["id"]) == row["digest"]:
+                unchanged += 1
+                continue
+            uploader.add(row, label=row["id"])
+
+    print(f"   {unchanged} môn không đổi, bỏ qua")
+    failed_codes = report(uploader, local_codes, time.time() - start)
+
+    # Xóa các môn không còn trong catalogue; môn chỉ vắng mặt vì crawl lỗi thì giữ lại
+    stale = sorted(remote_digests.keys() - local_codes - load_failed_codes())
+    delete_errors = []
+    delete_blocked = bool(stale) and not FORCE_DELETE and len(stale) > MAX_DELETE_FRACTION * len(remote_digests)
+    if delete_blocked:
+        print(f"⚠️ Bỏ qua xóa {len(stale)} môn (quá {MAX_DELETE_FRACTION:.0%} bảng). "
+              f"Kiểm tra catalogue rồi chạy lại với --force-delete.")
+    elif stale:
+        deleted, delete_errors = bulk_delete("courses", "id", stale, url=REST_URL, key=REST_KEY)
+        print(f"🗑️ Đã xóa {deleted} môn không còn trong catalogue")
+        for _, message in delete_errors:
+            print(f"⚠️ Lỗi khi xóa: {message}")
+
+    graph_ok = upload_prerequisite_graph(json_path)
+
+    if failed_codes or delete_errors or delete_blocked or not graph_ok:
+        print("\n⚠️ HOÀN TẤT NHƯNG CÓ LỖI! Chạy lại --sync để thử lại.")
+        sys.exit(1)
+
+    # Supabase đã khớp với catalogue, change set (nếu có) không còn cần thiết
+    clear_changes(DEFAULT_CHANGES_PATH)
+    refresh_search_stats()
+    print("\n✅ HOÀN TẤT! Supabase đã khớp với catalogue.")
+    sys.exit(0)
+
+if json_path:
+    print(f"📖 Đọc dữ liệu (từng bản ghi một) từ file: {json_path}")
+else:
+    print(f"❌ Lỗi: Không tìm thấy file master_courses trong '{data_dir}'")
     print("👉 Hãy kiểm tra lại xem file json đã nằm trong folder 'data' chưa.")
-    data = []
 
 # ======================================================
 # 3. UPLOAD DỮ LIỆU LÊN SUPABASE
 # ======================================================
-if data:
-    print("🚀 Bắt đầu đẩy dữ liệu lên Supabase...")
-    
-    batch_size = 50 
-    buffer = []
-    
-    for course in tqdm(data, desc="Uploading"):
-        # Tạo bản ghi theo đúng cột trong Database
-        record = {
-            "id": course["code"],             # Mã môn làm ID (VD: CSSE1001)
-            "title": course["title"],         # Tên môn
-            "raw_data": course                # Toàn bộ dữ liệu JSON nhét vào đây
-        }
-        buffer.append(record)
-        
-        # Gửi theo nhóm (Batch) để nhanh hơn
-        if len(buffer) >= batch_size:
-            try:
-                # upsert: Có rồi thì cập nhật, chưa có thì thêm mới
-                supabase.table("courses").upsert(buffer).execute()
-                buffer = [] # Xóa buffer sau khi gửi
-            except Exception as e:
-                print(f"⚠️ Lỗi batch: {e}")
-
-    # Gửi nốt những môn còn lại trong buffer
-    if buffer:
-        try:
-            supabase.table("courses").upsert(buffer).execute()
-        except Exception as e:
-            print(f"⚠️ Lỗi batch cuối: {e}")
+if json_path:
+    print(f"🚀 Bắt đầu đẩy dữ liệu lên Supabase ({MAX_IN_FLIGHT} batch song song, "
+          f"tối đa {MAX_BATCH_BYTES // 1024} KB/batch)...")
+
+    expected_codes = set()
+    start = time.time()
+
+    # Đọc từng môn một, không nạp cả file vào bộ nhớ; các batch được gửi song song trong lúc đọc
+    with new_uploader() as uploader:
+        for course in tqdm(iter_records(json_path), desc="Uploading"):
+            expected_codes.add(course["code"])
+            # upsert: Có rồi thì cập nhật, chưa có thì thêm mới
+            uploader.add(to_row(course), label=course["code"])
+
+    failed_codes = report(uploader, expected_codes, time.time() - start)
+
+    # Đối chiếu với số dòng thực tế trong bảng courses
+    remote_count = count_rows("courses", url=REST_URL, key=REST_KEY)
+    if remote_count is not None:
+        print(f"   - Số dòng trên Supabase: {remote_count}")
+        if remote_count < len(expected_codes) - len(failed_codes):
+            print("   ⚠️ Supabase có ít dòng hơn số môn đã ghi, hãy kiểm tra lại.")
+        elif remote_count > len(expected_codes):
+            print(f"   ℹ️ Supabase có {remote_count - len(expected_codes)} môn không còn trong catalogue.")
+
+    graph_ok = upload_prerequisite_graph(json_path)
+
+    if failed_codes or not graph_ok:
+        print("\n⚠️ HOÀN TẤT NHƯNG CÓ LỖI! Chạy lại script để thử lại các môn bị lỗi.")
+        sys.exit(1)
 
+    refresh_search_stats()
     print("\n✅ HOÀN TẤT! Hãy vào Supabase Dashboard > Table Editor để kiểm tra.")
 else:
     print("⚠️ Không có dữ liệu để upload.")
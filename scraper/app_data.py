@@ -0,0 +1,57 @@
+"""
+Extracts the `window.AppData = {...}` JSON embedded in programs-courses pages.
+
+The raw response bytes are scanned for the marker and the object is decoded in
+place with json.JSONDecoder.raw_decode, so no DOM is built and the decoder stops
+exactly at the end of the object (a regex can stop early at the first '};').
+"""
+
+import json
+
+APP_DATA_MARKER = b'window.AppData'
+SCRIPT_END = b'</script>'
+WHITESPACE = b' \t\r\n'
+
+_decoder = json.JSONDecoder()
+
+
+def _skip_whitespace(content, pos):
+    while pos < len(content) and content[pos] in WHITESPACE:
+        pos += 1
+    return pos
+
+
+def extract_app_data(content):
+    """
+    Decodes the window.AppData object from a page.
+
+    Args:
+        content: Raw page bytes (response.content) or text
+
+    Returns:
+        The decoded dict, or None if the page has no parsable window.AppData
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    start = content.find(APP_DATA_MARKER)
+    while start != -1:
+        pos = _skip_whitespace(content, start + len(APP_DATA_MARKER))
+
+        # Only an assignment counts (not e.g. a later `window.AppData.foo` read)
+        if content[pos:pos + 1] == b'=' and content[pos:pos + 2] != b'==':
+            pos = _skip_whitespace(content, pos + 1)
+
+            # A literal '</script>' cannot occur inside the inline object, so only
+            # the bytes up to it ever need decoding
+            end = content.find(SCRIPT_END, pos)
+            chunk = content[pos:end if end != -1 else len(content)].decode('utf-8', errors='replace')
+            try:
+                app_data, _ = _decoder.raw_decode(chunk)
+            except ValueError:
+                return None
+            return app_data if isinstance(app_data, dict) else None
+
+        start = content.find(APP_DATA_MARKER, pos)
+
+    return None
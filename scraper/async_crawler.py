@@ -0,0 +1,106 @@
+"""
+Asyncio crawl engine for the two-hop course page -> ECP (course profile) fetch.
+
+Each course page and each ECP page is its own unit of work gated by a single
+in-flight budget, so ECP fetches for finished course pages run alongside new
+course page fetches instead of serialising behind them.  Blocking fetch/parse
+calls are handed to a thread pool sized to the in-flight limit, which keeps
+them on the shared keep-alive pools in http_client.
+
+Cross-listed courses often share one course profile, so ECP fetches are
+single-flight: all courses pointing at the same (normalised) profile URL await
+one fetch, and its parsed assessment list is reused for the rest of the crawl.
+"""
+
+import asyncio
+import concurrent.futures
+import copy
+
+# Two hosts (course pages, profiles) at http_client's default per-host limit
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+class CourseCrawler:
+    """
+    Pipelines course page and ECP fetches with a configurable in-flight limit.
+
+    Args:
+        scrape_course: Callable(course_code) -> course dict, or None if the course does not exist
+        scrape_assessments: Callable(ecp_url) -> list of assessments
+        max_in_flight: Max number of requests outstanding at once
+        profile_key: Callable(ecp_url) -> key under which profile fetches are shared
+                     (e.g. a URL normaliser); default: the URL itself
+
+    Either callable may raise (e.g. retry.FetchError); the exception is handed to
+    on_result so the caller can decide whether the course is worth another pass.
+    """
+
+    def __init__(self, scrape_course, scrape_assessments, max_in_flight=DEFAULT_MAX_IN_FLIGHT, profile_key=None):
+        self.scrape_course = scrape_course
+        self.scrape_assessments = scrape_assessments
+        self.max_in_flight = max_in_flight
+        self.profile_key = profile_key or (lambda url: url)
+        self.profile_fetches = 0
+        self.profile_reuses = 0
+
+    async def _call(self, func, *args):
+        async with self._in_flight:
+            return await self._loop.run_in_executor(self._pool, func, *args)
+
+    async def _fetch_assessments(self, ecp_link):
+        key = self.profile_key(ecp_link)
+        task = self._profiles.get(key)
+        if task is None:
+            task = self._profiles[key] = asyncio.ensure_future(self._call(self.scrape_assessments, ecp_link))
+            self.profile_fetches += 1
+        else:
+            self.profile_reuses += 1
+
+        try:
+            # shield: one waiter being cancelled must not cancel the fetch the others share
+            assessments = await asyncio.shield(task)
+        except Exception:
+            # Forget failed fetches so a later course (or pass) can try the profile again
+            if self._profiles.get(key) is task:
+                del self._profiles[key]
+            raise
+
+        # Each course record gets its own copy of the shared result
+        return copy.deepcopy(assessments)
+
+    async def _crawl_course(self, course_code):
+        course_code = course_code.upper()
+        error = None
+        try:
+            course_data = await self._call(self.scrape_course, course_code)
+
+            if course_data and course_data['ecp_link']:
+                # The course slot is released here; the ECP hop competes for the budget on its own
+                course_data['assessments'] = await self._fetch_assessments(course_data['ecp_link'])
+        except Exception as exc:
+            course_data = None
+            error = exc
+
+        return course_code, course_data, error
+
+    async def _crawl_all(self, course_codes, on_result):
+        self._loop = asyncio.get_running_loop()
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._profiles = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            self._pool = pool
+            tasks = [asyncio.ensure_future(self._crawl_course(code)) for code in course_codes]
+
+            for task in asyncio.as_completed(tasks):
+                on_result(*await task)
+
+    def run(self, course_codes, on_result):
+        """
+        Crawls every course code, calling on_result(code, data, error) as each one completes.
+
+        `data` is None when the course does not exist (error None) or could not be
+        scraped (error is the exception raised).  Callbacks run on the event loop
+        thread, so they never race each other.
+        """
+        asyncio.run(self._crawl_all(course_codes, on_result))
@@ -0,0 +1,149 @@
+"""
+Benchmarks the course page parser backends and checks they agree.
+
+Saved course pages in data/fixtures/course_pages/ are parsed with:
+    legacy  - the original BeautifulSoup tree + one soup.find() per field
+    bs4     - course_parser single pass on html.parser
+    lxml    - course_parser single pass on lxml (if installed)
+
+Every backend must produce exactly the same record as the legacy parser.
+
+Usage:
+    python benchmark_parser.py            # benchmark the saved fixtures
+    python benchmark_parser.py --fetch 50 # first download 50 course pages as fixtures
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+import http_client
+from course_parser import BACKENDS, lxml
+from prereq_expr import parse_prerequisites
+from run_scraper import COURSE_URL, extract_course_codes, parse_course_page
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(script_dir, '..', 'data', 'fixtures', 'course_pages')
+REPEATS = 5
+
+
+def legacy_parse_course_page(course_code, html):
+    """The pre-course_parser implementation, kept as the parity reference."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def get_text(selector_id):
+        element = soup.find(id=selector_id)
+        return element.get_text(strip=True) if element else "N/A"
+
+    full_title = get_text('course-title')
+    units_text = get_text('course-units')
+    try:
+        units = int(units_text) if units_text != "N/A" else 0
+    except ValueError:
+        units = 0
+    contact = soup.find(id='course-contact')
+    prereq_raw = get_text('course-prerequisite')
+    incomp_raw = get_text('course-incompatible')
+
+    ecp_link = ""
+    ecp_tag = soup.find('a', class_='profile-available')
+    if ecp_tag:
+        ecp_link = ecp_tag['href']
+        if ecp_link.startswith('/'):
+            ecp_link = "https://programs-courses.uq.edu.au" + ecp_link
+
+    return {
+        "code": course_code,
+        "title": re.sub(r'\s\([A-Z]{4}\d{4}\)', '', full_title),
+        "units": units,
+        "level": get_text('course-level'),
+        "faculty": get_text('course-faculty'),
+        "school": get_text('course-school'),
+        "description": get_text('course-summary'),
+        "contact_hours": contact.get_text(separator=' ', strip=True) if contact else "N/A",
+        "assessment_summary": get_text('course-assessment-methods'),
+        "prerequisites_text": prereq_raw,
+        "prerequisites_list": extract_course_codes(prereq_raw),
+        "prerequisites_expr": parse_prerequisites(prereq_raw),
+        "incompatible_list": extract_course_codes(incomp_raw),
+        "coordinator": get_text('course-coordinator'),
+        "ecp_link": ecp_link,
+        "url": COURSE_URL.format(course_code=course_code)
+    }
+
+
+def fetch_fixtures(count):
+    """Downloads the first `count` course pages from course_codes_only.json."""
+    with open(os.path.join(script_dir, '..', 'data', 'course_codes_only.json'), 'r', encoding='utf-8') as f:
+        course_codes = json.load(f)[:count]
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for course_code in course_codes:
+        response = http_client.get(COURSE_URL.format(course_code=course_code))
+        if response.status_code == 200:
+            with open(os.path.join(FIXTURE_DIR, f"{course_code}.html"), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+    print(f"💾 Saved fixtures to: {FIXTURE_DIR}")
+
+
+def load_fixtures():
+    fixtures = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+                fixtures.append((name[:-len('.html')], f.read()))
+    return fixtures
+
+
+def time_parser(parse, fixtures):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for course_code, html in fixtures:
+            parse(course_code, html)
+    return (time.perf_counter() - start) / (REPEATS * len(fixtures))
+
+
+def main():
+    if '--fetch' in sys.argv:
+        fetch_fixtures(int(sys.argv[sys.argv.index('--fetch') + 1]))
+
+    if not os.path.isdir(FIXTURE_DIR) or not load_fixtures():
+        print(f"❌ No fixtures found in {FIXTURE_DIR}")
+        print("💡 Run 'python benchmark_parser.py --fetch 50' to download some")
+        return 1
+
+    fixtures = load_fixtures()
+    backends = [b for b in BACKENDS if b != 'lxml' or lxml is not None]
+    print(f"📋 {len(fixtures)} fixtures, backends: legacy, {', '.join(backends)}")
+
+    # Parity: every backend must match the legacy record field for field
+    mismatches = 0
+    for course_code, html in fixtures:
+        expected = legacy_parse_course_page(course_code, html)
+        for backend in backends:
+            actual = parse_course_page(course_code, html, backend=backend)
+            if actual != expected:
+                mismatches += 1
+                fields = sorted(k for k in expected.keys() | actual.keys()
+                                if k not in expected or k not in actual or expected[k] != actual[k])
+                print(f"❌ {course_code} [{backend}] differs in: {', '.join(fields)}")
+
+    if mismatches:
+        print(f"❌ {mismatches} mismatching records")
+        return 1
+    print("✅ All backends produce identical records")
+
+    baseline = time_parser(legacy_parse_course_page, fixtures)
+    print(f"⏱️  legacy: {baseline * 1000:.2f} ms/page")
+    for backend in backends:
+        per_page = time_parser(lambda c, h: parse_course_page(c, h, backend=backend), fixtures)
+        print(f"⏱️  {backend}: {per_page * 1000:.2f} ms/page ({baseline / per_page:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Local SQLite store for the scraped catalogue (data/catalogue.db).
+
+Scrapers write programs and courses here as each one finishes, and later
+stages read them back with indexed queries instead of loading whole JSON
+files.  The database runs in WAL mode, so a reader (e.g. check_missing_courses)
+can query it while a crawl is still writing.
+
+Tables:
+    programs         one row per program (name, UQ program id, faculty, units)
+    program_courses  compulsory course codes of each program
+    courses          one row per course, with the full record as JSON in `data`
+    prerequisites    course -> prerequisite / incompatible course code edges
+    assessments      assessment items from each course's profile
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(script_dir, '..', 'data', 'catalogue.db')
+
+PREREQUISITE = 'prerequisite'
+INCOMPATIBLE = 'incompatible'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (
+    name        TEXT PRIMARY KEY,
+    program_id  TEXT,
+    faculty     TEXT,
+    total_units INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS programs_faculty ON programs (faculty);
+
+CREATE TABLE IF NOT EXISTS program_courses (
+    program_name TEXT NOT NULL REFERENCES programs (name) ON DELETE CASCADE,
+    course_code  TEXT NOT NULL,
+    PRIMARY KEY (program_name, course_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS program_courses_code ON program_courses (course_code);
+
+CREATE TABLE IF NOT EXISTS courses (
+    code       TEXT PRIMARY KEY,
+    title      TEXT,
+    units      INTEGER,
+    level      TEXT,
+    faculty    TEXT,
+    school     TEXT,
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS prerequisites (
+    course_code  TEXT NOT NULL REFERENCES courses (code) ON DELETE CASCADE,
+    related_code TEXT NOT NULL,
+    kind         TEXT NOT NULL,
+    PRIMARY KEY (course_code, kind, related_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prerequisites_related ON prerequisites (related_code, kind);
+
+CREATE TABLE IF NOT EXISTS assessments (
+    course_code TEXT NOT NULL REFERENCES courses (code) ON DELETE CASCADE,
+    position    INTEGER NOT NULL,
+    category    TEXT,
+    task        TEXT,
+    weight      REAL,
+    due_date    TEXT,
+    flags       TEXT,
+    PRIMARY KEY (course_code, position)
+) WITHOUT ROWID;
+"""
+
+
+class CatalogueDB:
+    """
+    Connection to the catalogue database, creating the schema on first use.
+
+    Writes are meant to come from one thread (the scraper's result loop);
+    each write is its own short transaction.
+
+    Args:
+        path: Location of the SQLite file
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL is still crash-safe; only the last commits can be lost on power failure
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    # --- Programs ---
+
+    def upsert_program(self, name, program_data, program_id=None):
+        """
+        Stores one scraped program and replaces its course list.
+
+        Args:
+            name: Program name (the key used in programs_*.json)
+            program_data: Dict with 'courses', 'total_units' and 'faculty'
+            program_id: UQ program id, if known
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO programs (name, program_id, faculty, total_units, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET program_id = COALESCE(excluded.program_id, program_id), "
+                "faculty = excluded.faculty, total_units = excluded.total_units, updated_at = excluded.updated_at",
+                (name, program_id, program_data.get('faculty'), program_data.get('total_units', 0), time.time())
+            )
+            self.conn.execute("DELETE FROM program_courses WHERE program_name = ?", (name,))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO program_courses (program_name, course_code) VALUES (?, ?)",
+                [(name, code) for code in program_data.get('courses', [])]
+            )
+
+    def prune_programs(self, faculty, keep_names):
+        """
+        Deletes the programs of `faculty` that are not in `keep_names` (with their course lists).
+
+        Call it with every program the faculty page lists in this run, so
+        withdrawn or renamed programs stop feeding the crawl list.
+        Listed programs that failed to scrape keep their last good row.
+
+        Returns:
+            Number of programs deleted
+        """
+        keep_names = set(keep_names)
+        stale = [name for (name,) in self.conn.execute("SELECT name FROM programs WHERE faculty = ?", (faculty,))
+                 if name not in keep_names]
+        with self.conn:
+            self.conn.executemany("DELETE FROM programs WHERE name = ?", [(name,) for name in stale])
+        return len(stale)
+
+    def program_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM programs").fetchone()[0]
+
+    def program_course_codes(self):
+        """Sorted unique course codes across all programs."""
+        rows = self.conn.execute("SELECT DISTINCT course_code FROM program_courses ORDER BY course_code")
+        return [code for (code,) in rows]
+
+    # --- Courses ---
+
+    def upsert_course(self, record):
+        """Stores one scraped course record with its prerequisite edges and assessments."""
+        code = record['code']
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO courses (code, title, units, level, faculty, school, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (code) DO UPDATE SET title = excluded.title, units = excluded.units, "
+                "level = excluded.level, faculty = excluded.faculty, school = excluded.school, "
+                "data = excluded.data, updated_at = excluded.updated_at",
+                (code, record.get('title'), record.get('units'), record.get('level'), record.get('faculty'),
+                 record.get('school'), json.dumps(record, ensure_ascii=False, separators=(',', ':')), time.time())
+            )
+            self.conn.execute("DELETE FROM prerequisites WHERE course_code = ?", (code,))
+            self.conn.execute("DELETE FROM assessments WHERE course_code = ?", (code,))
+            edges = [(code, related, PREREQUISITE) for related in record.get('prerequisites_list', [])]
+            edges += [(code, related, INCOMPATIBLE) for related in record.get('incompatible_list', [])]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO prerequisites (course_code, related_code, kind) VALUES (?, ?, ?)", edges
+            )
+            self.conn.executemany(
+                "INSERT INTO assessments (course_code, position, category, task, weight, due_date, flags) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(code, position, item.get('category'), item.get('assesment_task'), item.get('weight'),
+                  item.get('due_date'), json.dumps(item.get('flags', {})))
+                 for position, item in enumerate(record.get('assessments', []))]
+            )
+
+    def delete_courses(self, codes):
+        with self.conn:
+            self.conn.executemany("DELETE FROM courses WHERE code = ?", [(code,) for code in codes])
+
+    def course_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+
+    def course_codes(self):
+        return {code for (code,) in self.conn.execute("SELECT code FROM courses")}
+
+    def iter_courses(self):
+        """Yields full course records in code order, one at a time."""
+        for (data,) in self.conn.execute("SELECT data FROM courses ORDER BY code"):
+            yield json.loads(data)
+
+    def missing_course_codes(self, expected_codes=None):
+        """
+        Course codes that are expected but have no scraped record.
+
+        Args:
+            expected_codes: Codes to check; default: every code referenced by a program
+
+        Returns:
+            Sorted list of missing codes
+        """
+        if expected_codes is None:
+            rows = self.conn.execute(
+                "SELECT DISTINCT course_code FROM program_courses "
+                "WHERE course_code NOT IN (SELECT code FROM courses) ORDER BY course_code"
+            )
+            return [code for (code,) in rows]
+
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS expected_codes (code TEXT PRIMARY KEY)")
+        with self.conn:
+            self.conn.execute("DELETE FROM expected_codes")
+            self.conn.executemany("INSERT OR IGNORE INTO expected_codes VALUES (?)",
+                                  [(code,) for code in expected_codes])
+        rows = self.conn.execute(
+            "SELECT code FROM expected_codes WHERE code NOT IN (SELECT code FROM courses) ORDER BY code"
+        )
+        return [code for (code,) in rows]
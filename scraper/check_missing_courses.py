@@ -1,16 +1,23 @@
 import json
 import os
+from catalogue_db import DEFAULT_DB_PATH, CatalogueDB
+from checkpoint import CrawlCheckpoint
+from jsonl_io import find_master_courses, iter_records
 
 def get_missing_courses():
     """
-    Compares course_codes_only.json with master_courses.json to find missing courses.
+    Compares all_course_codes.json with the scraped courses to find missing courses.
+
+    Uses a single query against the catalogue database when it has courses (the
+    crawl writes each course there as it finishes), otherwise the master_courses file.
     Returns a list of missing course codes.
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
     # Paths
-    all_codes_path = os.path.join(script_dir, '..', 'data', 'all_course_codes.json')
-    master_path = os.path.join(script_dir, '..', 'data', 'master_courses.json')
+    data_dir = os.path.join(script_dir, '..', 'data')
+    all_codes_path = os.path.join(data_dir, 'all_course_codes.json')
+    master_path = find_master_courses(data_dir)
     
     # Load all expected course codes
     try:
@@ -21,19 +28,31 @@ def get_missing_courses():
         print(f"❌ Error: {all_codes_path} not found.")
         return []
 
-    # Load already scraped courses
+    if os.path.exists(DEFAULT_DB_PATH):
+        with CatalogueDB() as db:
+            if db.course_count():
+                print(f"✅ Already scraped courses: {db.course_count()}")
+                missing_codes = db.missing_course_codes(all_codes)
+                print(f"📉 Missing courses: {len(missing_codes)}")
+                return missing_codes
+
+    # Load already scraped course codes, streaming the catalogue record by record
     try:
-        if os.path.exists(master_path):
-            with open(master_path, 'r', encoding='utf-8') as f:
-                master_data = json.load(f)
-                scraped_codes = set(item['code'] for item in master_data)
+        if master_path:
+            scraped_codes = set(item['code'] for item in iter_records(master_path))
             print(f"✅ Already scraped courses: {len(scraped_codes)}")
         else:
-            print("⚠️ master_courses.json not found. Assuming 0 courses scraped.")
+            print("⚠️ No master_courses catalogue found. Assuming 0 courses scraped.")
             scraped_codes = set()
     except Exception as e:
-        print(f"❌ Error reading master_courses.json: {e}")
+        print(f"❌ Error reading {master_path}: {e}")
         return []
+
+    # Include courses finished by a crawl that is still running (or was interrupted)
+    checkpoint_codes = CrawlCheckpoint().codes()
+    if checkpoint_codes:
+        print(f"♻️ Courses in crawl checkpoint: {len(checkpoint_codes)}")
+        scraped_codes |= checkpoint_codes
     
     # Calculate missing courses
     missing_codes = sorted(list(all_codes - scraped_codes))
@@ -0,0 +1,79 @@
+"""
+Durable checkpoint log for the course crawl.
+
+Every finished course is appended to a JSON Lines file as soon as it completes,
+so an interrupted run (crash, Ctrl-C) can resume by skipping the codes already
+in the log instead of starting over.
+"""
+
+import json
+import os
+
+from jsonl_io import iter_records
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CHECKPOINT_PATH = os.path.join(script_dir, '..', 'data', 'master_courses.checkpoint.jsonl')
+
+# fsync after this many appended records (every record is flushed to the OS regardless)
+FSYNC_EVERY = 50
+
+
+class CrawlCheckpoint:
+    """
+    Append-only log of scraped course records, keyed by course code.
+
+    Args:
+        path: Location of the checkpoint file
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self._file = None
+        self._unsynced = 0
+
+    def iter_records(self):
+        """
+        Streams every record in the log, one at a time.
+
+        A partially written last line (from a crash mid-write) is ignored.
+        """
+        if not os.path.exists(self.path):
+            return
+        yield from iter_records(self.path, skip_invalid=True)
+
+    def codes(self):
+        """Returns the set of course codes already in the log (without keeping the records)."""
+        return {record['code'] for record in self.iter_records()}
+
+    def append(self, record):
+        """Appends one finished course record and flushes it to disk."""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            # Start on a fresh line if the previous run died mid-write
+            if self._file.tell() > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._file.write('\n')
+
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+
+    def remove(self):
+        """Deletes the log once the crawl's final output has been written."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,187 @@
+"""
+Change detection between course crawls.
+
+Each course record is reduced to a stable hash of its canonical JSON form and
+kept in `course_hashes.json`.  After a crawl the new hashes are compared with
+the stored ones, and the courses that were added, modified or removed are
+written to a change set (`course_changes.jsonl`) that upload_courses.py can
+apply instead of re-upserting the whole catalogue.
+
+A change set that has not been applied yet is merged into the next one, so a
+skipped or failed upload never loses changes.
+
+Courses that failed to fetch are listed in `crawl_failed_courses.json`, so a
+full sync (upload_courses.py --sync) does not delete them either.
+"""
+
+import hashlib
+import json
+import os
+
+from jsonl_io import iter_records
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(script_dir, '..', 'data')
+DEFAULT_HASHES_PATH = os.path.join(DATA_DIR, 'course_hashes.json')
+DEFAULT_CHANGES_PATH = os.path.join(DATA_DIR, 'course_changes.jsonl')
+DEFAULT_FAILED_PATH = os.path.join(DATA_DIR, 'crawl_failed_courses.json')
+
+ADDED = 'added'
+MODIFIED = 'modified'
+REMOVED = 'removed'
+
+
+def record_hash(record):
+    """
+    Stable SHA-256 of a course record.
+
+    Keys are sorted and whitespace is fixed, so the hash only changes when the
+    content does, not when fields are produced in a different order.
+    """
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_hashes(path=DEFAULT_HASHES_PATH):
+    """Returns the stored {course code: hash} map, or {} before the first crawl."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_hashes(hashes, path=DEFAULT_HASHES_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, sort_keys=True, indent=0)
+    os.replace(tmp_path, path)
+
+
+def load_failed_codes(path=DEFAULT_FAILED_PATH):
+    """Returns the codes that failed to fetch in the last crawl, or an empty set."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return set(json.load(f))
+
+
+def save_failed_codes(codes, path=DEFAULT_FAILED_PATH):
+    if not codes:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sorted(codes), f, indent=0)
+    os.replace(tmp_path, path)
+
+
+class DeltaTracker:
+    """
+    Diffs a fresh crawl against the stored hashes.
+
+    Usage:
+        tracker = DeltaTracker()
+        for record in records:
+            tracker.observe(record)
+        tracker.finish(keep_codes=failed_courses)
+
+    Args:
+        hashes_path: Where the per-course hashes are kept
+        changes_path: Where the change set is written
+        failed_path: Where the codes passed as keep_codes are written
+    """
+
+    def __init__(self, hashes_path=DEFAULT_HASHES_PATH, changes_path=DEFAULT_CHANGES_PATH,
+                 failed_path=DEFAULT_FAILED_PATH):
+        self.hashes_path = hashes_path
+        self.changes_path = changes_path
+        self.failed_path = failed_path
+        self.previous = load_hashes(hashes_path)
+        self.current = {}
+        self.counts = {ADDED: 0, MODIFIED: 0, REMOVED: 0}
+        self.removed_codes = []
+        self._changes = {}
+
+    def observe(self, record):
+        """Hashes one crawled record and notes it if it is new or changed."""
+        code = record['code']
+        digest = record_hash(record)
+        self.current[code] = digest
+
+        old = self.previous.get(code)
+        if old is None:
+            self._changes[code] = {'change': ADDED, 'code': code, 'record': record}
+        elif old != digest:
+            self._changes[code] = {'change': MODIFIED, 'code': code, 'record': record}
+
+    def finish(self, keep_codes=()):
+        """
+        Writes the change set, the new hashes and the failed codes.
+
+        Args:
+            keep_codes: Codes missing from this crawl only because they failed to
+                fetch; they keep their old hash instead of counting as removed.
+
+        Returns:
+            Dict of change type -> number of courses in the written change set
+        """
+        failed_codes = {code.upper() for code in keep_codes} - self.current.keys()
+        for code in failed_codes:
+            if code in self.previous:
+                self.current[code] = self.previous[code]
+
+        self.removed_codes = sorted(self.previous.keys() - self.current.keys())
+        for code in self.removed_codes:
+            self._changes[code] = {'change': REMOVED, 'code': code}
+
+        changes = self._merge_pending(self._changes)
+        self._write_changes(changes)
+        save_hashes(self.current, self.hashes_path)
+        save_failed_codes(failed_codes, self.failed_path)
+
+        self.counts = {ADDED: 0, MODIFIED: 0, REMOVED: 0}
+        for change in changes.values():
+            self.counts[change['change']] += 1
+        return self.counts
+
+    def _merge_pending(self, changes):
+        """Folds an unapplied change set from an earlier crawl under this one."""
+        if not os.path.exists(self.changes_path):
+            return changes
+
+        merged = {}
+        for change in iter_records(self.changes_path, skip_invalid=True):
+            merged[change['code']] = change
+        for code, change in changes.items():
+            pending = merged.get(code)
+            # Still new to the database if the earlier "added" was never applied
+            if pending and pending['change'] == ADDED and change['change'] == MODIFIED:
+                change = {**change, 'change': ADDED}
+            merged[code] = change
+        return merged
+
+    def _write_changes(self, changes):
+        if not changes:
+            if os.path.exists(self.changes_path):
+                os.remove(self.changes_path)
+            return
+
+        tmp_path = self.changes_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for code in sorted(changes):
+                f.write(json.dumps(changes[code], ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.changes_path)
+
+
+def iter_changes(path=DEFAULT_CHANGES_PATH):
+    """Yields the entries of a change set: {'change', 'code'[, 'record']}."""
+    if not os.path.exists(path):
+        return
+    yield from iter_records(path)
+
+
+def clear_changes(path=DEFAULT_CHANGES_PATH):
+    """Deletes a change set once it has been applied."""
+    if os.path.exists(path):
+        os.remove(path)
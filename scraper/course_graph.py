@@ -0,0 +1,477 @@
+"""
+Prerequisite graph engine over the course catalogue.
+
+Courses are numbered 0..n-1 and edges are stored as CSR (compressed sparse
+row) arrays: for course i, its neighbours are targets[offsets[i]:offsets[i+1]].
+Three adjacencies are kept:
+
+    prereqs       course -> courses it lists as prerequisites
+    dependents    course -> courses that list it (prereqs reversed)
+    incompatible  course -> courses it cannot be taken with (both directions)
+
+Every operation takes a batch of codes and walks the arrays once, so
+questions the client answers with a recursive `courses.find` walk
+(O(n^2) per render) are linear here:
+
+    ancestors / descendants   transitive prerequisites / dependents
+    blocked                   courses ruled out by failed courses, honouring
+                              AND/OR prerequisite expressions
+    plan_semesters            topological semester plan under a unit limit
+    strongly_connected_components / condensation
+                              prerequisite cycles (Tarjan) and the acyclic
+                              graph of components, written to prereq_scc.json
+                              by the pipeline so consumers need no runtime
+                              cycle handling
+
+Usage:
+    python course_graph.py ancestors CSSE3100
+    python course_graph.py plan CSSE3100 COMP3506 --passed CSSE1001 --max-units 8
+    python course_graph.py scc
+"""
+
+import argparse
+import json
+import os
+from array import array
+from collections import deque
+
+from jsonl_io import find_master_courses, iter_records
+from prereq_expr import AND, EQUIVALENT, can_still_satisfy
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(script_dir, '..', 'data')
+
+# Units assumed for a course whose record has none (the standard UQ course)
+DEFAULT_UNITS = 2
+DEFAULT_MAX_UNITS_PER_SEMESTER = 8
+DEFAULT_SCC_PATH = os.path.join(DATA_DIR, 'prereq_scc.json')
+
+
+def _build_csr(n, edges):
+    """
+    Packs (source, target) pairs into CSR arrays.
+
+    Returns:
+        (offsets, targets): offsets has n+1 entries; targets of i are
+        targets[offsets[i]:offsets[i+1]], in the order the edges were given
+    """
+    counts = [0] * (n + 1)
+    for source, _ in edges:
+        counts[source + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    offsets = array('i', counts)
+
+    targets = array('i', bytes(4 * len(edges)))
+    fill = list(counts[:n])
+    for source, target in edges:
+        targets[fill[source]] = target
+        fill[source] += 1
+    return offsets, targets
+
+
+class CourseGraph:
+    """
+    Integer-indexed prerequisite / incompatibility graph.
+
+    Build with CourseGraph.from_records(records) or CourseGraph.load().
+    Codes referenced as prerequisites but missing from the catalogue get a
+    node too (known[i] is False), so every edge has both ends.
+    """
+
+    def __init__(self, codes, units, known, prereq_edges, incompatible_edges, exprs):
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.units = array('i', units)
+        self.known = known
+        # AND/OR prerequisite expressions by node (missing: plain AND of the prereqs)
+        self.exprs = exprs
+
+        n = len(codes)
+        self.prereq_offsets, self.prereq_targets = _build_csr(n, prereq_edges)
+        self.dependent_offsets, self.dependent_targets = _build_csr(n, [(t, s) for s, t in prereq_edges])
+        both_ways = incompatible_edges + [(t, s) for s, t in incompatible_edges]
+        self.incompatible_offsets, self.incompatible_targets = _build_csr(n, sorted(set(both_ways)))
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds the graph from course records (code, units, prerequisites_list/_expr, incompatible_list)."""
+        codes = []
+        index = {}
+        units = []
+        known = []
+        raw = []
+
+        def node(code):
+            if code not in index:
+                index[code] = len(codes)
+                codes.append(code)
+                units.append(DEFAULT_UNITS)
+                known.append(False)
+            return index[code]
+
+        for record in records:
+            i = node(record['code'])
+            units[i] = record.get('units') or DEFAULT_UNITS
+            known[i] = True
+            raw.append((i, record))
+
+        prereq_edges = []
+        incompatible_edges = []
+        exprs = {}
+        for i, record in raw:
+            for code in dict.fromkeys(record.get('prerequisites_list') or []):
+                if code != record['code']:
+                    prereq_edges.append((i, node(code)))
+            for code in dict.fromkeys(record.get('incompatible_list') or []):
+                if code != record['code']:
+                    incompatible_edges.append((i, node(code)))
+            if record.get('prerequisites_expr') is not None:
+                exprs[i] = record['prerequisites_expr']
+
+        return cls(codes, units, known, prereq_edges, incompatible_edges, exprs)
+
+    @classmethod
+    def load(cls, data_dir=DATA_DIR):
+        """Builds the graph from the master_courses catalogue in data_dir."""
+        path = find_master_courses(data_dir)
+        if not path:
+            raise FileNotFoundError(f"No master_courses catalogue in {data_dir}")
+        return cls.from_records(iter_records(path))
+
+    def __len__(self):
+        return len(self.codes)
+
+    # --- Lookups ---
+
+    def _indices(self, codes):
+        return [self.index[code] for code in codes if code in self.index]
+
+    def prerequisites(self, code):
+        i = self.index[code]
+        return [self.codes[j] for j in self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]]]
+
+    def dependents(self, code):
+        i = self.index[code]
+        return [self.codes[j] for j in self.dependent_targets[self.dependent_offsets[i]:self.dependent_offsets[i + 1]]]
+
+    def incompatible_with(self, code):
+        i = self.index[code]
+        return [self.codes[j]
+                for j in self.incompatible_targets[self.incompatible_offsets[i]:self.incompatible_offsets[i + 1]]]
+
+    # --- Batched traversals ---
+
+    def _reach(self, starts, offsets, targets):
+        seen = bytearray(len(self.codes))
+        queue = deque(starts)
+        reached = []
+        while queue:
+            i = queue.popleft()
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                if not seen[j]:
+                    seen[j] = 1
+                    reached.append(j)
+                    queue.append(j)
+        return reached
+
+    def ancestors(self, codes):
+        """Every direct or indirect prerequisite of any of `codes`."""
+        reached = self._reach(self._indices(codes), self.prereq_offsets, self.prereq_targets)
+        return {self.codes[i] for i in reached}
+
+    def descendants(self, codes):
+        """Every course that directly or indirectly requires any of `codes`."""
+        reached = self._reach(self._indices(codes), self.dependent_offsets, self.dependent_targets)
+        return {self.codes[i] for i in reached}
+
+    def _satisfiable(self, i, unavailable):
+        """Can course i's prerequisites still be met if none of `unavailable` (node flags) can be?"""
+        expr = self.exprs.get(i)
+        if expr is None:
+            prereqs = self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]]
+            return not any(unavailable[j] for j in prereqs)
+        # Everything not ruled out counts as passable; "or equivalent" keeps no branch open
+        return can_still_satisfy(expr, lambda code: code in self.index and unavailable[self.index[code]])
+
+    def blocked(self, failed_codes):
+        """
+        Courses that can no longer be taken because of failed courses.
+
+        Blocking propagates down the dependents: a course is blocked when its
+        prerequisite expression cannot be satisfied without the failed or
+        blocked courses (an OR with another open branch stays open).
+
+        Returns:
+            Set of blocked codes (the failed courses themselves excluded)
+        """
+        unavailable = bytearray(len(self.codes))
+        queue = deque()
+        for i in self._indices(failed_codes):
+            unavailable[i] = 1
+            queue.append(i)
+
+        blocked = set()
+        while queue:
+            i = queue.popleft()
+            for j in self.dependent_targets[self.dependent_offsets[i]:self.dependent_offsets[i + 1]]:
+                if not unavailable[j] and not self._satisfiable(j, unavailable):
+                    unavailable[j] = 1
+                    blocked.add(self.codes[j])
+                    queue.append(j)
+        return blocked
+
+    # --- Planning ---
+
+    def _chosen_prereqs(self, i, done, chosen):
+        """
+        Prerequisite nodes course i needs, picking one branch of each OR.
+
+        Prefers a branch already passed or already in the plan, then the
+        alternative needing the fewest courses.
+        """
+        expr = self.exprs.get(i)
+        if expr is None:
+            return list(self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]])
+
+        def pick(node):
+            if isinstance(node, str):
+                if node == EQUIVALENT or node not in self.index:
+                    return []
+                return [self.index[node]]
+            branches = [pick(child) for child in node[1:]]
+            if node[0] == AND:
+                return [j for branch in branches for j in branch]
+            for branch in branches:
+                if all(done[j] or chosen[j] for j in branch):
+                    return branch
+            return min(branches, key=len)
+
+        return pick(expr)
+
+    def plan_semesters(self, targets, passed=(), max_units=DEFAULT_MAX_UNITS_PER_SEMESTER):
+        """
+        Topological semester plan for taking `targets`.
+
+        Pulls in every prerequisite still needed (one branch per OR), then
+        fills semesters in order: a course is placed once all its chosen
+        prerequisites are passed or planned for an earlier semester, lowest
+        course code first, until the semester's units reach max_units.
+
+        Args:
+            targets: Codes to plan for
+            passed: Codes already passed
+            max_units: Unit limit per semester
+
+        Returns:
+            Dict with:
+                semesters:  list of lists of codes, one per semester
+                unplaced:   codes that could not be scheduled (not in the
+                            catalogue, or stuck in a prerequisite cycle)
+                conflicts:  [code, code] pairs of incompatible courses in the plan
+        """
+        n = len(self.codes)
+        done = bytearray(n)
+        for i in self._indices(passed):
+            done[i] = 1
+
+        # Courses to take, and the prerequisites each one waits for
+        chosen = bytearray(n)
+        waits_for = {}
+        unplaced = [code for code in targets if code not in self.index]
+        queue = deque(i for i in self._indices(targets) if not done[i])
+        for i in queue:
+            chosen[i] = 1
+        while queue:
+            i = queue.popleft()
+            needs = [j for j in self._chosen_prereqs(i, done, chosen) if not done[j]]
+            waits_for[i] = needs
+            for j in needs:
+                if not chosen[j]:
+                    chosen[j] = 1
+                    queue.append(j)
+
+        # Courses missing from the catalogue cannot be scheduled
+        for i in list(waits_for):
+            if not self.known[i]:
+                unplaced.append(self.codes[i])
+                del waits_for[i]
+
+        remaining = {i: set(needs) & waits_for.keys() for i, needs in waits_for.items()}
+        semesters = []
+        while remaining:
+            ready = sorted((i for i, needs in remaining.items() if not needs), key=lambda i: self.codes[i])
+            if not ready:
+                break
+
+            semester = []
+            used = 0
+            for i in ready:
+                if semester and used + self.units[i] > max_units:
+                    break
+                semester.append(i)
+                used += self.units[i]
+
+            for i in semester:
+                del remaining[i]
+            placed = set(semester)
+            for needs in remaining.values():
+                needs -= placed
+            semesters.append([self.codes[i] for i in semester])
+
+        unplaced.extend(self.codes[i] for i in remaining)
+
+        planned = {self.index[code] for semester in semesters for code in semester}
+        planned.update(self._indices(passed))
+        conflicts = sorted({tuple(sorted((self.codes[i], self.codes[j])))
+                            for i in planned
+                            for j in self.incompatible_targets[self.incompatible_offsets[i]:self.incompatible_offsets[i + 1]]
+                            if j in planned})
+
+        return {
+            'semesters': semesters,
+            'unplaced': sorted(set(unplaced)),
+            'conflicts': [list(pair) for pair in conflicts]
+        }
+
+    # --- Cycles ---
+
+    def strongly_connected_components(self):
+        """
+        Tarjan's algorithm over the prerequisite edges, iterative and O(V + E).
+
+        Components are numbered in the order Tarjan completes them, which is a
+        topological order of the condensation with prerequisites first: every
+        prerequisite component has a lower id than the courses needing it.
+
+        Returns:
+            array of component id per node
+        """
+        n = len(self.codes)
+        offsets, targets = self.prereq_offsets, self.prereq_targets
+        index = array('i', [-1]) * n
+        low = array('i', [0]) * n
+        component = array('i', [-1]) * n
+        on_stack = bytearray(n)
+        stack = []
+        counter = 0
+        next_component = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            # Each frame: (node, position of the next edge to look at)
+            work = [(root, offsets[root])]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                v, edge = work[-1]
+                if edge < offsets[v + 1]:
+                    work[-1] = (v, edge + 1)
+                    w = targets[edge]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, offsets[w]))
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = next_component
+                        if w == v:
+                            break
+                    next_component += 1
+
+        return component
+
+    def condensation(self):
+        """
+        Collapses every prerequisite cycle into one node.
+
+        Returns:
+            Dict with:
+                component:  {code: component id} (ids in prerequisites-first topological order)
+                cycles:     lists of codes forming a cycle (components of 2+ courses)
+                dag:        {component id: sorted prerequisite component ids}, acyclic
+        """
+        component = self.strongly_connected_components()
+
+        members = {}
+        for i, c in enumerate(component):
+            members.setdefault(c, []).append(self.codes[i])
+
+        dag = {}
+        for i in range(len(self.codes)):
+            ci = component[i]
+            for j in self.prereq_targets[self.prereq_offsets[i]:self.prereq_offsets[i + 1]]:
+                if component[j] != ci:
+                    dag.setdefault(ci, set()).add(component[j])
+
+        return {
+            'component': {code: component[i] for i, code in enumerate(self.codes)},
+            'cycles': sorted(sorted(codes) for codes in members.values() if len(codes) > 1),
+            'dag': {c: sorted(prereqs) for c, prereqs in sorted(dag.items())}
+        }
+
+
+def write_condensation(graph, path=DEFAULT_SCC_PATH):
+    """
+    Writes the graph's condensation (see CourseGraph.condensation) to a JSON file.
+
+    Returns:
+        The condensation dict
+    """
+    condensed = graph.condensation()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(condensed, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return condensed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the course prerequisite graph")
+    parser.add_argument('command', choices=['ancestors', 'descendants', 'blocked', 'plan', 'scc'])
+    parser.add_argument('codes', nargs='*', help="Course codes (failed courses for 'blocked')")
+    parser.add_argument('--passed', nargs='*', default=[], help="Already passed courses (for 'plan')")
+    parser.add_argument('--max-units', type=int, default=DEFAULT_MAX_UNITS_PER_SEMESTER)
+    args = parser.parse_args()
+
+    graph = CourseGraph.load()
+    codes = [code.upper() for code in args.codes]
+
+    if args.command == 'scc':
+        condensed = write_condensation(graph)
+        print(f"{len(condensed['dag'])} components with prerequisites, {len(condensed['cycles'])} cycles")
+        for cycle in condensed['cycles']:
+            print(f"🔁 {' -> '.join(cycle)}")
+        print(f"Saved to: {DEFAULT_SCC_PATH}")
+        return
+
+    if args.command == 'ancestors':
+        result = sorted(graph.ancestors(codes))
+    elif args.command == 'descendants':
+        result = sorted(graph.descendants(codes))
+    elif args.command == 'blocked':
+        result = sorted(graph.blocked(codes))
+    else:
+        result = graph.plan_semesters(codes, [code.upper() for code in args.passed], args.max_units)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
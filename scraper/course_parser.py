@@ -0,0 +1,129 @@
+"""
+Single-pass extraction of the `course-*` sections from a course page.
+
+The course page scraper used to build a BeautifulSoup tree and then call
+`soup.find(id=...)` once per field.  Here every element whose id starts with
+`course-` (plus the ECP link) is collected in one traversal, with a choice of
+parser backend:
+
+    bs4   - BeautifulSoup with html.parser (no extra dependency), the default
+    lxml  - C parser, opt-in with backend='lxml' when lxml is installed
+
+Text is flattened the same way as BeautifulSoup's get_text(), so both backends
+should produce identical records.  lxml only becomes the default once the
+parity test (tests/test_course_parser.py) passes over real course pages saved
+with `benchmark_parser.py --fetch`.
+"""
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+BACKENDS = ['lxml', 'bs4']
+DEFAULT_BACKEND = 'bs4'
+
+SECTION_PREFIX = 'course-'
+ECP_LINK_CLASS = 'profile-available'
+
+# get_text() does not treat the contents of these tags as text
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def _join(strings, separator):
+    return separator.join(s for s in (s.strip() for s in strings) if s)
+
+
+# --- lxml backend ---
+
+def _lxml_strings(element):
+    """Yields the text nodes under an element in document order, skipping comments."""
+    if element.tag in NON_TEXT_TAGS:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have a non-string tag
+        if isinstance(child.tag, str):
+            yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _extract_lxml(html):
+    root = lxml.html.fromstring(html)
+    sections = {}
+    ecp_href = None
+
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        element_id = element.get('id')
+        if element_id and element_id.startswith(SECTION_PREFIX) and element_id not in sections:
+            sections[element_id] = list(_lxml_strings(element))
+        elif ecp_href is None and element.tag == 'a' and ECP_LINK_CLASS in (element.get('class') or '').split():
+            ecp_href = element.get('href')
+
+    return sections, ecp_href
+
+
+# --- BeautifulSoup backend ---
+
+def _is_wanted_tag(tag):
+    element_id = tag.get('id')
+    if element_id and element_id.startswith(SECTION_PREFIX):
+        return True
+    return tag.name == 'a' and ECP_LINK_CLASS in tag.get('class', [])
+
+
+def _extract_bs4(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    sections = {}
+    ecp_href = None
+
+    for tag in soup.find_all(_is_wanted_tag):
+        element_id = tag.get('id')
+        if element_id and element_id.startswith(SECTION_PREFIX):
+            if element_id not in sections:
+                sections[element_id] = list(tag.strings)
+        elif ecp_href is None:
+            ecp_href = tag.get('href')
+
+    return sections, ecp_href
+
+
+_EXTRACTORS = {
+    'lxml': _extract_lxml,
+    'bs4': _extract_bs4,
+}
+
+
+def extract_course_sections(html, backend=None):
+    """
+    Collects every `course-*` section and the ECP link from a course page in one pass.
+
+    Args:
+        html: Page source (str or bytes)
+        backend: 'lxml' or 'bs4' (default: DEFAULT_BACKEND)
+
+    Returns:
+        Dict with keys:
+            text: {section_id: text joined like get_text(strip=True)}
+            spaced_text: {section_id: text joined like get_text(separator=' ', strip=True)}
+            ecp_href: href of the "profile available" link, or None
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in _EXTRACTORS:
+        raise ValueError(f"Unknown parser backend '{backend}' (expected one of {BACKENDS})")
+    if backend == 'lxml' and lxml is None:
+        raise ImportError("The 'lxml' parser backend needs the lxml package installed")
+
+    sections, ecp_href = _EXTRACTORS[backend](html)
+
+    return {
+        'text': {k: _join(v, '') for k, v in sections.items()},
+        'spaced_text': {k: _join(v, ' ') for k, v in sections.items()},
+        'ecp_href': ecp_href,
+    }
@@ -1,9 +1,13 @@
 import json
 import os
+from catalogue_db import DEFAULT_DB_PATH, CatalogueDB
 
 def main():
     """
-    Extracts all unique course codes from programs2.json and saves them to course_codes_only.json.
+    Extracts all unique course codes from the programs and saves them to course_codes_only.json.
+
+    Reads the catalogue database (one indexed query) when it has programs,
+    otherwise falls back to programs2.json.
     """
     print("=" * 60)
     print("EXTRACTING COURSE CODES")
@@ -15,18 +19,26 @@ def main():
     output_path = os.path.join(script_dir, '..', 'data', 'course_codes_only.json')
     
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            programs_data = json.load(f)
-        
-        print(f"✅ Loaded {len(programs_data)} programs from {input_path}")
-        
-        # Extract unique courses
-        unique_courses = set()
-        for program_info in programs_data.values():
-            courses = program_info.get('courses', [])
-            unique_courses.update(courses)
-        
-        course_list = sorted(list(unique_courses))
+        course_list = None
+        if os.path.exists(DEFAULT_DB_PATH):
+            with CatalogueDB() as db:
+                if db.program_count():
+                    print(f"✅ Loaded {db.program_count()} programs from {DEFAULT_DB_PATH}")
+                    course_list = db.program_course_codes()
+
+        if course_list is None:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                programs_data = json.load(f)
+
+            print(f"✅ Loaded {len(programs_data)} programs from {input_path}")
+
+            # Extract unique courses
+            unique_courses = set()
+            for program_info in programs_data.values():
+                courses = program_info.get('courses', [])
+                unique_courses.update(courses)
+
+            course_list = sorted(list(unique_courses))
         
         # Save to file
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,536 @@
+"""
+Generic UQ faculty program scraper.
+
+One scraper for every faculty, driven by the FACULTIES list: all faculties are
+scraped inside one process, and the program requirement pages of all faculties
+share one worker pool (and therefore the same keep-alive connections).  Each faculty is still saved to its own
+data/programs_<code>.json for combine_departments.py.
+
+Usage:
+    python faculty_scraper.py            # all faculties
+    python faculty_scraper.py bel sci    # only the given faculty codes
+"""
+
+import concurrent.futures
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+
+import http_client
+from app_data import extract_app_data
+from catalogue_db import CatalogueDB
+
+FACULTIES = [
+    {"code": "bel", "name": "Business, Economics and Law"},
+    {"code": "eait", "name": "Engineering, Architecture and Information Technology"},
+    {"code": "hlbs", "name": "Health and Life Sciences"},
+    {"code": "hss", "name": "Humanities and Social Sciences"},
+    {"code": "med", "name": "Medicine"},
+    {"code": "sci", "name": "Science"},
+]
+
+# Worker threads; actual concurrency per host is adapted by http_client's throttle
+MAX_WORKERS = 8
+# Requirement years to try for each program, newest first
+DEFAULT_YEARS = [2026, 2025, 2024]
+# Threads for parallel year probes (each program probes up to len(DEFAULT_YEARS) at once)
+PROBE_WORKERS = 32
+HEADERS = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(script_dir, '..', 'data')
+YEAR_HINTS_PATH = os.path.join(DATA_DIR, 'program_year_hints.json')
+# How long a program's hinted year is trusted before all years are probed again
+YEAR_HINT_TTL = 7 * 24 * 60 * 60
+
+
+# --- STEP 1: SCRAPE PROGRAMS FROM A FACULTY ---
+
+def scrape_faculty_programs(faculty_code):
+    """
+    Scrapes all program names and links from a specific faculty page.
+
+    Args:
+        faculty_code: Faculty code (e.g., 'eait', 'sci')
+
+    Returns:
+        List of dicts with keys: name, link, program_id, faculty
+    """
+    url = f"https://programs-courses.uq.edu.au/faculty.html?faculty={faculty_code}"
+
+    try:
+        response = http_client.get(url, headers=HEADERS, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ Failed to fetch faculty page '{faculty_code}': Status {response.status_code}")
+            return []
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        # Find all program links
+        program_links = soup.select("a[href*='program.html?acad_prog=']")
+
+        programs = []
+        for link in program_links:
+            program_name = link.get_text(strip=True)
+            program_url = link['href']
+
+            # Make absolute URL if needed
+            if program_url.startswith('/'):
+                program_url = "https://programs-courses.uq.edu.au" + program_url
+
+            # Extract program ID from URL
+            match = re.search(r'acad_prog=(\d+)', program_url)
+            program_id = match.group(1) if match else None
+
+            if program_id and program_name:
+                programs.append({
+                    "name": program_name,
+                    "link": program_url,
+                    "program_id": program_id,
+                    "faculty": faculty_code
+                })
+
+        return programs
+
+    except Exception as e:
+        print(f"⚠️ Error scraping faculty {faculty_code}: {e}")
+        return []
+
+
+# --- STEP 2: SCRAPE COMPULSORY COURSES BY EXTRACTING window.AppData JSON ---
+
+def extract_compulsory_courses(app_data):
+    """
+    Pulls the compulsory (SR1) course codes and minimum units out of window.AppData.
+
+    Returns:
+        Tuple of (set of course codes, total_units)
+    """
+    # Extract total units required
+    program_reqs = app_data.get('programRequirements', {})
+    total_units = program_reqs.get('unitsMinimum', 0)
+
+    # Extract course codes from the program requirements
+    course_codes = set()
+
+    # Navigate through the JSON structure to find courses
+    payload = program_reqs.get('payload', {})
+    components = payload.get('components', [])
+
+    # Recursive function to extract courses from parts
+    def extract_courses_from_part(part):
+        """Recursively extract courses from a part and its nested parts"""
+        # Check if this part has a selection rule indicating compulsory courses
+        header = part.get('header', {})
+        selection_rule = header.get('selectionRule', {})
+        rule_code = selection_rule.get('code', '')
+
+        # SR1 = "Complete ALL units for ALL of the following" (compulsory)
+        is_compulsory = (rule_code == 'SR1')
+
+        # Get the body of this part
+        body = part.get('body', [])
+
+        for item in body:
+            row_type = item.get('rowType', '')
+
+            # If this is a curriculum reference (course), extract it
+            if row_type == 'CurriculumReference':
+                curr_ref = item.get('curriculumReference', {})
+                if curr_ref.get('type') == 'Course':
+                    course_code = curr_ref.get('code')
+                    if course_code and re.match(r'^[A-Z]{4}\d{4}$', course_code) and is_compulsory:
+                        course_codes.add(course_code)
+
+            # If this is an equivalence group, extract all courses in it
+            elif row_type == 'EquivalenceGroup':
+                equiv_group = item.get('equivalenceGroup', [])
+                for equiv_item in equiv_group:
+                    curr_ref = equiv_item.get('curriculumReference', {})
+                    if curr_ref.get('type') == 'Course':
+                        course_code = curr_ref.get('code')
+                        if course_code and re.match(r'^[A-Z]{4}\d{4}$', course_code) and is_compulsory:
+                            course_codes.add(course_code)
+
+            # If this item has nested parts (SubRule), recurse
+            if 'header' in item and 'body' in item:
+                extract_courses_from_part(item)
+
+    # Extract courses from all components
+    for component in components:
+        if component.get('type') == 'PROGRAM_RULE':
+            # This component contains the program rules with parts
+            rules_payload = component.get('payload', {})
+            body_parts = rules_payload.get('body', [])
+
+            for part in body_parts:
+                extract_courses_from_part(part)
+
+    return course_codes, total_units
+
+
+def scrape_program_year(program_id, year):
+    """
+    Fetches one year's requirements page for a program.
+
+    Returns:
+        Tuple of (sorted course codes, total_units), or None if that year has no
+        usable requirements (missing page, no longer offered, no courses/units)
+    """
+    url = f"https://programs-courses.uq.edu.au/requirements/program/{program_id}/{year}"
+
+    response = http_client.get(url, headers=HEADERS, timeout=10)
+    if response.status_code != 200:
+        return None
+
+    # Decode window.AppData straight from the raw bytes (no DOM needed)
+    app_data = extract_app_data(response.content)
+
+    if app_data is None:
+        return None
+
+    # Check if program is no longer offered
+    if app_data.get('status', {}).get('noLongerOffered'):
+        return None
+
+    course_codes, total_units = extract_compulsory_courses(app_data)
+    if not (course_codes or total_units):
+        return None
+
+    return sorted(course_codes), total_units
+
+
+class YearHints:
+    """
+    Remembers the last valid requirements year of each program between runs.
+
+    A hinted year is probed on its own.  The hint is dropped, and every year is
+    probed again, when the newest year in the probe list changes or once the
+    hint is older than `ttl` seconds, so a newer year published under the same
+    list is picked up within one TTL.
+    """
+
+    def __init__(self, path=YEAR_HINTS_PATH, ttl=YEAR_HINT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._hints = json.load(f)
+        except (OSError, ValueError):
+            self._hints = {}
+
+    def get(self, program_id, years):
+        hint = self._hints.get(str(program_id))
+        if (hint and hint['newest_probed'] == years[0] and hint['year'] in years
+                and time.time() - hint.get('checked_at', 0) < self.ttl):
+            return hint['year']
+        return None
+
+    def set(self, program_id, year, years):
+        """Records the year found by probing all of `years`."""
+        with self._lock:
+            self._hints[str(program_id)] = {'year': year, 'newest_probed': years[0], 'checked_at': time.time()}
+
+    def save(self):
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._hints, f, indent=2, sort_keys=True)
+
+
+_probe_executor = None
+_probe_executor_lock = threading.Lock()
+
+
+def _get_probe_executor():
+    # Separate from the callers' pools: their workers block on these probes
+    global _probe_executor
+    with _probe_executor_lock:
+        if _probe_executor is None:
+            _probe_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=PROBE_WORKERS, thread_name_prefix="year-probe")
+        return _probe_executor
+
+
+def _try_program_year(program_id, year):
+    try:
+        return scrape_program_year(program_id, year)
+    except Exception:
+        return None
+
+
+def probe_program_years(program_id, years):
+    """
+    Requests every year at once and returns the newest one with valid requirements.
+
+    Results are taken newest-first: as soon as the newest still-possible year
+    answers with valid data it wins, and probes that have not started yet are
+    cancelled.
+
+    Returns:
+        Tuple of (year, (courses, total_units)), or None if no year is valid
+    """
+    executor = _get_probe_executor()
+    futures = [(year, executor.submit(_try_program_year, program_id, year)) for year in years]
+    try:
+        for year, future in futures:
+            result = future.result()
+            if result:
+                return year, result
+        return None
+    finally:
+        for _, future in futures:
+            future.cancel()
+
+
+def scrape_program_courses_json(program_info, years=DEFAULT_YEARS, hints=None):
+    """
+    Scrapes compulsory courses and total units by extracting window.AppData JSON from the HTML.
+
+    Args:
+        program_info: Dict with keys: name, program_id (and optionally faculty)
+        years: List of years to try, newest first (default: DEFAULT_YEARS)
+        hints: Optional YearHints; a trusted hinted year is probed alone, and the
+               year found by a full probe is recorded for the next run
+
+    Returns:
+        Tuple of (program_name, dict with 'courses', 'total_units' and 'faculty')
+    """
+    program_name = program_info['name']
+    program_id = program_info['program_id']
+
+    found = None
+    hinted_year = hints.get(program_id, years) if hints else None
+    if hinted_year:
+        found = probe_program_years(program_id, [hinted_year])
+
+    if not found:
+        # No (valid) hint: probe the remaining years in parallel
+        found = probe_program_years(program_id, [year for year in years if year != hinted_year])
+        if found and hints:
+            hints.set(program_id, found[0], years)
+
+    if found:
+        year, (courses, total_units) = found
+        return (program_name, {
+            'courses': courses,
+            'total_units': total_units,
+            'faculty': program_info.get('faculty', 'unknown')
+        })
+
+    # If all years failed, return empty result
+    return (program_name, {
+        'courses': [],
+        'total_units': 0,
+        'faculty': program_info.get('faculty', 'unknown')
+    })
+
+
+def scrape_programs(programs, max_workers=MAX_WORKERS, desc="Scraping courses", hints=None):
+    """
+    Scrapes the compulsory courses of many programs with one shared thread pool.
+
+    `hints` (a YearHints) is passed through to scrape_program_courses_json.
+
+    Returns:
+        Tuple of (list of (program_info, program_data) for programs with courses,
+                  list of failed program infos)
+    """
+    results = []
+    failed_programs = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submit all tasks
+        future_to_program = {
+            executor.submit(scrape_program_courses_json, program, DEFAULT_YEARS, hints): program
+            for program in programs
+        }
+
+        # Process results as they complete
+        for future in tqdm(
+            concurrent.futures.as_completed(future_to_program),
+            total=len(programs),
+            desc=desc
+        ):
+            program = future_to_program[future]
+            try:
+                _, program_data = future.result()
+                if program_data['courses']:  # Check if courses list is not empty
+                    results.append((program, program_data))
+                else:
+                    failed_programs.append(program)
+            except Exception as exc:
+                print(f"\n⚠️ {program['name']} generated an exception: {exc}")
+                failed_programs.append(program)
+
+    return results, failed_programs
+
+
+# --- STEP 3: SAVE ONE FILE PER FACULTY ---
+
+def save_faculty_results(faculty, results, failed_programs):
+    """
+    Writes one faculty's programs to data/programs_<code>.json and prints its stats.
+    """
+    output_path = os.path.join(DATA_DIR, f"programs_{faculty['code']}.json")
+
+    try:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+        tqdm.write(f"\n✅ {faculty['name']}: scraped {len(results)} programs with courses")
+        tqdm.write(f"✅ Saved to: {output_path}")
+
+        # Show some statistics
+        if results:
+            total_courses = sum(len(data['courses']) for data in results.values())
+            avg_courses = total_courses / len(results) if results else 0
+            tqdm.write(f"📊 Total compulsory courses found: {total_courses}")
+            tqdm.write(f"📊 Average courses per program: {avg_courses:.1f}")
+
+        if failed_programs:
+            tqdm.write(f"⚠️ Failed to get courses for {len(failed_programs)} programs:")
+            for prog in failed_programs[:10]:  # Show first 10
+                tqdm.write(f"   - {prog['name']}")
+            if len(failed_programs) > 10:
+                tqdm.write(f"   ... and {len(failed_programs) - 10} more")
+        return True
+
+    except Exception as e:
+        tqdm.write(f"\n❌ Error saving {output_path}: {e}")
+        return False
+
+
+def scrape_faculties(faculties, max_workers=MAX_WORKERS, request_budget=None):
+    """
+    Scrapes all given faculties concurrently and saves one file per faculty.
+
+    Each program is also written to the catalogue database as soon as it is scraped,
+    and programs a faculty page no longer lists are removed from it.
+
+    Faculty pages are fetched in parallel, and each faculty's programs are queued
+    on the shared pool as soon as its list arrives, so program fetches from
+    different faculties interleave.  A faculty's file is written the moment its
+    last program finishes, with progress streamed as results come in.
+
+    Args:
+        faculties: Dicts with keys: code, name
+        max_workers: Size of the shared worker pool
+        request_budget: Max simultaneous requests to UQ across all faculties
+                        (default: max_workers)
+
+    Returns:
+        List of faculty codes that could not be scraped or saved
+    """
+    http_client.configure(max_workers=max_workers, per_host_limit=request_budget)
+    print(f"⚡ Scraping {len(faculties)} faculties concurrently "
+          f"({max_workers} workers, request budget {request_budget or max_workers})")
+
+    hints = YearHints()
+    db = CatalogueDB()
+    faculty_by_code = {f['code']: f for f in faculties}
+    state = {f['code']: {'pending': None, 'results': {}, 'failed': [], 'start': time.time()} for f in faculties}
+    failed_faculties = []
+
+    def finish_faculty(code):
+        faculty_state = state[code]
+        duration = time.time() - faculty_state['start']
+        tqdm.write(f"🏁 {code} finished in {duration:.1f}s")
+        if not save_faculty_results(faculty_by_code[code], faculty_state['results'], faculty_state['failed']):
+            failed_faculties.append(code)
+
+    progress = tqdm(total=0, desc="Scraping programs")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # future -> ('faculty', code) or ('program', program_info)
+        pending = {executor.submit(scrape_faculty_programs, f['code']): ('faculty', f['code']) for f in faculties}
+
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                kind, item = pending.pop(future)
+
+                if kind == 'faculty':
+                    programs = future.result()
+                    if not programs:
+                        tqdm.write(f"❌ No programs found for {faculty_by_code[item]['name']}")
+                        failed_faculties.append(item)
+                        continue
+
+                    tqdm.write(f"📋 {item}: found {len(programs)} programs")
+                    removed = db.prune_programs(item, [program['name'] for program in programs])
+                    if removed:
+                        tqdm.write(f"🗑️ {item}: removed {removed} programs no longer listed")
+                    state[item]['pending'] = len(programs)
+                    progress.total += len(programs)
+                    progress.refresh()
+                    for program in programs:
+                        pending[executor.submit(scrape_program_courses_json, program, DEFAULT_YEARS, hints)] = ('program', program)
+                    continue
+
+                code = item['faculty']
+                try:
+                    program_name, program_data = future.result()
+                    if program_data['courses']:  # Check if courses list is not empty
+                        state[code]['results'][program_name] = program_data
+                        db.upsert_program(program_name, program_data, program_id=item['program_id'])
+                    else:
+                        state[code]['failed'].append(item)
+                except Exception as exc:
+                    tqdm.write(f"⚠️ {item['name']} generated an exception: {exc}")
+                    state[code]['failed'].append(item)
+
+                progress.update(1)
+                state[code]['pending'] -= 1
+                if state[code]['pending'] == 0:
+                    finish_faculty(code)
+
+    progress.close()
+    db.close()
+    hints.save()
+    for line in http_client.throttle_report():
+        tqdm.write(f"📶 {line}")
+    return failed_faculties
+
+
+# --- MAIN EXECUTION ---
+
+def main(faculty_codes=None, max_workers=MAX_WORKERS, request_budget=None):
+    """
+    Scrapes the given faculty codes (default: all of FACULTIES).
+
+    Returns:
+        List of faculty codes that failed
+    """
+    print("=" * 60)
+    print("UQ FACULTY PROGRAM SCRAPER")
+    print("=" * 60)
+
+    faculties = FACULTIES
+    if faculty_codes:
+        known_codes = {f['code'] for f in FACULTIES}
+        unknown = [c for c in faculty_codes if c not in known_codes]
+        if unknown:
+            print(f"❌ Unknown faculty codes: {', '.join(unknown)}")
+            print(f"💡 Known codes: {', '.join(sorted(known_codes))}")
+            return unknown
+        faculties = [f for f in FACULTIES if f['code'] in faculty_codes]
+
+    http_client.enable_cache(http_client.DEFAULT_CACHE_DIR)
+    failed_faculties = scrape_faculties(faculties, max_workers=max_workers, request_budget=request_budget)
+
+    print("\n" + "=" * 60)
+    print("SCRAPING COMPLETE")
+    print("=" * 60)
+    return failed_faculties
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(sys.argv[1:]) else 0)
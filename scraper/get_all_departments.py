@@ -1,10 +1,15 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import json
 import re
-import concurrent.futures
 from tqdm import tqdm
 import os
+from catalogue_db import CatalogueDB
+from faculty_scraper import YearHints, scrape_faculty_programs, scrape_programs
+
+# Per-faculty program scraping is shared with faculty_scraper.py;
+# this script discovers the faculty list itself and writes one combined programs2.json
+# (and the same programs to the catalogue database).
 
 # --- STEP 1: SCRAPE ALL FACULTIES ---
 
@@ -22,7 +27,7 @@ def scrape_all_faculties():
     headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         if response.status_code != 200:
             print(f"❌ Failed to fetch browse page: Status {response.status_code}")
             return []
@@ -54,184 +59,6 @@ def scrape_all_faculties():
         return []
 
 
-# --- STEP 2: SCRAPE PROGRAMS FROM A FACULTY ---
-
-def scrape_faculty_programs(faculty_code):
-    """
-    Scrapes all program names and links from a specific faculty page.
-    
-    Args:
-        faculty_code: Faculty code (e.g., 'eait', 'science')
-    
-    Returns:
-        List of dicts with keys: name, link, program_id
-    """
-    url = f"https://programs-courses.uq.edu.au/faculty.html?faculty={faculty_code}"
-    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all program links
-        program_links = soup.select("a[href*='program.html?acad_prog=']")
-        
-        programs = []
-        for link in program_links:
-            program_name = link.get_text(strip=True)
-            program_url = link['href']
-            
-            # Make absolute URL if needed
-            if program_url.startswith('/'):
-                program_url = "https://programs-courses.uq.edu.au" + program_url
-            
-            # Extract program ID from URL
-            match = re.search(r'acad_prog=(\d+)', program_url)
-            program_id = match.group(1) if match else None
-            
-            if program_id and program_name:
-                programs.append({
-                    "name": program_name,
-                    "link": program_url,
-                    "program_id": program_id,
-                    "faculty": faculty_code
-                })
-        
-        return programs
-        
-    except Exception as e:
-        print(f"⚠️ Error scraping faculty {faculty_code}: {e}")
-        return []
-
-
-# --- STEP 3: SCRAPE COMPULSORY COURSES BY EXTRACTING window.AppData JSON ---
-
-def scrape_program_courses_json(program_info, years=[2026, 2025, 2024]):
-    """
-    Scrapes compulsory courses and total units by extracting window.AppData JSON from the HTML.
-    
-    Args:
-        program_info: Dict with keys: name, program_id
-        years: List of years to try (default: [2026, 2025, 2024])
-    
-    Returns:
-        Tuple of (program_name, dict with 'courses' and 'total_units')
-    """
-    program_name = program_info['name']
-    program_id = program_info['program_id']
-    headers = {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
-    
-    for year in years:
-        url = f"https://programs-courses.uq.edu.au/requirements/program/{program_id}/{year}"
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                continue  # Try next year
-            
-            # Find the script tag containing window.AppData
-            soup = BeautifulSoup(response.text, 'html.parser')
-            script_tags = soup.find_all('script', string=re.compile('window\\.AppData'))
-            
-            if not script_tags:
-                continue  # Try next year
-            
-            # Extract the JSON from the script tag
-            script_content = script_tags[0].string
-            json_match = re.search(r'window\.AppData\s*=\s*({.*?});', script_content, re.DOTALL)
-            
-            if not json_match:
-                continue  # Try next year
-            
-            # Parse the JSON
-            app_data = json.loads(json_match.group(1))
-            
-            # Check if program is no longer offered
-            if app_data.get('status', {}).get('noLongerOffered'):
-                continue  # Try next year
-            
-            # Extract total units required
-            program_reqs = app_data.get('programRequirements', {})
-            total_units = program_reqs.get('unitsMinimum', 0)
-            
-            # Extract course codes from the program requirements
-            course_codes = set()
-            
-            # Navigate through the JSON structure to find courses
-            payload = program_reqs.get('payload', {})
-            components = payload.get('components', [])
-            
-            # Recursive function to extract courses from parts
-            def extract_courses_from_part(part):
-                """Recursively extract courses from a part and its nested parts"""
-                # Check if this part has a selection rule indicating compulsory courses
-                header = part.get('header', {})
-                selection_rule = header.get('selectionRule', {})
-                rule_code = selection_rule.get('code', '')
-                
-                # SR1 = "Complete ALL units for ALL of the following" (compulsory)
-                is_compulsory = (rule_code == 'SR1')
-                
-                # Get the body of this part
-                body = part.get('body', [])
-                
-                for item in body:
-                    row_type = item.get('rowType', '')
-                    
-                    # If this is a curriculum reference (course), extract it
-                    if row_type == 'CurriculumReference':
-                        curr_ref = item.get('curriculumReference', {})
-                        if curr_ref.get('type') == 'Course':
-                            course_code = curr_ref.get('code')
-                            if course_code and re.match(r'^[A-Z]{4}\d{4}$', course_code) and is_compulsory:
-                                course_codes.add(course_code)
-                    
-                    # If this is an equivalence group, extract all courses in it
-                    elif row_type == 'EquivalenceGroup':
-                        equiv_group = item.get('equivalenceGroup', [])
-                        for equiv_item in equiv_group:
-                            curr_ref = equiv_item.get('curriculumReference', {})
-                            if curr_ref.get('type') == 'Course':
-                                course_code = curr_ref.get('code')
-                                if course_code and re.match(r'^[A-Z]{4}\d{4}$', course_code) and is_compulsory:
-                                    course_codes.add(course_code)
-                    
-                    # If this item has nested parts (SubRule), recurse
-                    if 'header' in item and 'body' in item:
-                        extract_courses_from_part(item)
-            
-            # Extract courses from all components
-            for component in components:
-                if component.get('type') == 'PROGRAM_RULE':
-                    # This component contains the program rules with parts
-                    rules_payload = component.get('payload', {})
-                    body_parts = rules_payload.get('body', [])
-                    
-                    for part in body_parts:
-                        extract_courses_from_part(part)
-            
-            if course_codes or total_units:
-                return (program_name, {
-                    'courses': sorted(list(course_codes)),
-                    'total_units': total_units,
-                    'faculty': program_info.get('faculty', 'unknown')
-                })
-                
-        except Exception as e:
-            # Try next year
-            continue
-    
-    # If all years failed, return empty result
-    return (program_name, {
-        'courses': [], 
-        'total_units': 0,
-        'faculty': program_info.get('faculty', 'unknown')
-    })
-
-
 # --- MAIN EXECUTION ---
 
 def main():
@@ -257,10 +84,13 @@ def main():
     # Step 2: Get all programs from all faculties
     print("\n📚 STEP 2: Scraping programs from all faculties...")
     all_programs = []
+    listed_by_faculty = {}
     
     for faculty in tqdm(faculties, desc="Scraping faculties"):
         programs = scrape_faculty_programs(faculty['code'])
         all_programs.extend(programs)
+        if programs:
+            listed_by_faculty[faculty['code']] = [program['name'] for program in programs]
     
     print(f"\n✅ Found {len(all_programs)} total programs across all faculties")
     
@@ -269,32 +99,21 @@ def main():
     print("⚡ Using concurrent requests with 8 workers")
     
     MAX_WORKERS = 8
-    results = {}
-    failed_programs = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all tasks
-        future_to_program = {
-            executor.submit(scrape_program_courses_json, program): program 
-            for program in all_programs
-        }
-        
-        # Process results as they complete
-        for future in tqdm(
-            concurrent.futures.as_completed(future_to_program), 
-            total=len(all_programs), 
-            desc="Scraping courses"
-        ):
-            program = future_to_program[future]
-            try:
-                program_name, program_data = future.result()
-                if program_data['courses']:  # Check if courses list is not empty
-                    results[program_name] = program_data
-                else:
-                    failed_programs.append(program_name)
-            except Exception as exc:
-                print(f"\n⚠️ {program['name']} generated an exception: {exc}")
-                failed_programs.append(program['name'])
+    http_client.configure(max_workers=MAX_WORKERS)
+    http_client.enable_cache(http_client.DEFAULT_CACHE_DIR)
+    hints = YearHints()
+    scraped, failed = scrape_programs(all_programs, max_workers=MAX_WORKERS, hints=hints)
+    hints.save()
+    results = {program['name']: program_data for program, program_data in scraped}
+    failed_programs = [program['name'] for program in failed]
+
+    # Keep the catalogue database in step with programs2.json: store every scraped
+    # program and drop programs a faculty page no longer lists
+    with CatalogueDB() as db:
+        for program, program_data in scraped:
+            db.upsert_program(program['name'], program_data, program_id=program['program_id'])
+        removed = sum(db.prune_programs(code, names) for code, names in listed_by_faculty.items())
+    print(f"🗄️ Catalogue database: {len(scraped)} programs stored, {removed} no longer listed removed")
     
     # Save results to JSON
     # Use absolute path relative to script location to ensure it works from any CWD
@@ -0,0 +1,191 @@
+"""
+On-disk HTTP response cache with ETag / Last-Modified revalidation.
+
+Layout under the cache directory:
+    index/<sha256(url)>.json    validators + metadata for one URL
+    bodies/<sha256(body)>.gz    gzip-compressed response body (content-addressed,
+                                so identical pages are only stored once)
+
+Cached URLs are revalidated with a conditional GET; on 304 the stored body is
+served without downloading it again.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_TTL = 30 * 24 * 3600          # Entries older than this are refetched in full
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # Size cap for stored bodies
+
+# Response headers worth keeping alongside the body
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified"]
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ResponseCache:
+    """
+    Stores 200 responses on disk and turns repeat fetches into conditional GETs.
+
+    Args:
+        cache_dir: Directory to keep the cache in (created if missing)
+        ttl: Seconds after which an entry is discarded instead of revalidated
+        max_bytes: Total body size above which least recently used entries are evicted
+    """
+
+    def __init__(self, cache_dir, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_dir = os.path.join(cache_dir, 'index')
+        self.body_dir = os.path.join(cache_dir, 'bodies')
+        os.makedirs(self.index_dir, exist_ok=True)
+        os.makedirs(self.body_dir, exist_ok=True)
+
+    def _index_path(self, url):
+        return os.path.join(self.index_dir, _sha256(url.encode('utf-8')) + '.json')
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.body_dir, body_hash + '.gz')
+
+    def lookup(self, url):
+        """Returns the index entry for a URL, or None if missing or expired."""
+        index_path = self._index_path(url)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        if not os.path.exists(self._body_path(entry['body'])):
+            return None
+        return entry
+
+    def conditional_headers(self, entry):
+        """Builds the If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """Saves a 200 response that carries at least one validator."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        body = response.content
+        body_hash = _sha256(body)
+        body_path = self._body_path(body_hash)
+        if not os.path.exists(body_path):
+            _write_atomic(body_path, gzip.compress(body, compresslevel=6))
+
+        entry = {
+            'url': url,
+            'body': body_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+            'fetched_at': time.time(),
+        }
+        _write_atomic(self._index_path(url), json.dumps(entry).encode('utf-8'))
+
+    def revalidated(self, entry, response):
+        """
+        Builds a 200 response from a cached entry after the server answered 304.
+
+        The entry's clock is reset so the TTL counts from the latest revalidation.
+        """
+        with gzip.open(self._body_path(entry['body']), 'rb') as f:
+            body = f.read()
+
+        entry['fetched_at'] = time.time()
+        _write_atomic(self._index_path(entry['url']), json.dumps(entry).encode('utf-8'))
+
+        cached = requests.Response()
+        cached.status_code = 200
+        cached._content = body
+        cached.url = entry['url']
+        cached.encoding = entry.get('encoding')
+        cached.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        cached.request = response.request
+        cached.from_cache = True
+        return cached
+
+    def prune(self):
+        """
+        Drops expired entries, then evicts least recently revalidated entries
+        until stored bodies fit in max_bytes.  Unreferenced bodies are deleted.
+
+        Returns:
+            Number of index entries removed
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for name in os.listdir(self.index_dir):
+            if not name.endswith('.json'):
+                continue
+            index_path = os.path.join(self.index_dir, name)
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+
+            if not entry or now - entry.get('fetched_at', 0) > self.ttl:
+                os.remove(index_path)
+                removed += 1
+            else:
+                entries.append((entry['fetched_at'], index_path, entry['body']))
+
+        body_sizes = {}
+        for name in os.listdir(self.body_dir):
+            if not name.endswith('.gz'):
+                continue
+            body_sizes[name[:-len('.gz')]] = os.path.getsize(os.path.join(self.body_dir, name))
+
+        # Oldest first; keep evicting until the live bodies fit
+        entries.sort()
+        referenced = {}
+        for _, _, body_hash in entries:
+            referenced[body_hash] = referenced.get(body_hash, 0) + 1
+        total = sum(body_sizes.get(h, 0) for h in referenced)
+
+        for _, index_path, body_hash in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(index_path)
+            removed += 1
+            referenced[body_hash] -= 1
+            if referenced[body_hash] == 0:
+                del referenced[body_hash]
+                total -= body_sizes.get(body_hash, 0)
+
+        for body_hash in body_sizes:
+            if body_hash not in referenced:
+                os.remove(self._body_path(body_hash))
+
+        return removed
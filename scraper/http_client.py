@@ -0,0 +1,202 @@
+"""
+Shared HTTP layer for all UQ scrapers.
+
+Every scraper fetches through `get()` instead of calling `requests.get` directly,
+so connections to my.uq.edu.au / programs-courses.uq.edu.au are kept alive and
+reused rather than paying a fresh TCP + TLS handshake for every page.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from http_cache import ResponseCache
+from rate_limit import DEFAULT_RATE, HostThrottle
+from retry import RETRYABLE, RetryPolicy, classify_exception, classify_status
+
+# Hosts the scrapers talk to; one keep-alive pool is reserved per host.
+UQ_HOSTS = [
+    "my.uq.edu.au",
+    "programs-courses.uq.edu.au",
+    "course-profiles.uq.edu.au",
+]
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', '.http_cache')
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    # gzip/deflate always, plus br (and zstd) when the brotli/zstandard packages are installed
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "Connection": "keep-alive",
+}
+
+_config = {
+    "max_workers": DEFAULT_MAX_WORKERS,
+    "per_host_limit": DEFAULT_MAX_WORKERS,
+    "rate_per_host": DEFAULT_RATE,
+    "retry": RetryPolicy(),
+    "cache": None,
+}
+_config_lock = threading.Lock()
+_throttles = {}
+_local = threading.local()
+
+
+def configure(max_workers=None, per_host_limit=None, rate_per_host=None, retry=None):
+    """
+    Tunes the connection pools and per-host throttles to the caller's worker count.
+
+    Concurrency per host is adaptive (see rate_limit.AimdLimiter): it starts low,
+    grows while the server answers quickly and backs off on 429/5xx/timeouts.
+    The values here are only ceilings.
+
+    Args:
+        max_workers: Number of threads that will fetch concurrently
+        per_host_limit: Max simultaneous connections to any one host
+                        (default: same as max_workers)
+        rate_per_host: Max requests/second to any one host
+        retry: RetryPolicy for transient failures (keeps the current one if None)
+    """
+    with _config_lock:
+        if max_workers:
+            _config["max_workers"] = max_workers
+        _config["per_host_limit"] = per_host_limit or _config["max_workers"]
+        if rate_per_host:
+            _config["rate_per_host"] = rate_per_host
+        if retry:
+            _config["retry"] = retry
+        # Fresh throttles are created lazily with the new limits
+        _throttles.clear()
+
+
+def enable_cache(cache_dir, **cache_options):
+    """
+    Turns on the on-disk response cache for every subsequent get().
+
+    Expired and over-budget entries are evicted up front.
+
+    Args:
+        cache_dir: Directory for the cache
+        **cache_options: ttl / max_bytes, passed to ResponseCache
+
+    Returns:
+        The ResponseCache in use
+    """
+    cache = ResponseCache(cache_dir, **cache_options)
+    evicted = cache.prune()
+    if evicted:
+        print(f"🧹 Evicted {evicted} stale cache entries")
+    _config["cache"] = cache
+    return cache
+
+
+def _throttle_for(host):
+    with _config_lock:
+        throttle = _throttles.get(host)
+        if throttle is None:
+            limit = _config["per_host_limit"]
+            throttle = HostThrottle(
+                rate=_config["rate_per_host"],
+                initial_concurrency=min(4, limit),
+                max_concurrency=limit
+            )
+            _throttles[host] = throttle
+        return throttle
+
+
+def throttle_report():
+    """Returns one line per host describing where its adaptive limits settled."""
+    with _config_lock:
+        return [f"{host}: {throttle.describe()}" for host, throttle in sorted(_throttles.items())]
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None  # HTTP-date form; the AIMD back-off still applies
+
+
+def get_session():
+    """
+    Returns this thread's keep-alive session, creating it on first use.
+
+    Each worker thread only ever has one request in flight, so its pool holds a
+    single connection per host; the total pool size therefore tracks the worker count.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=len(UQ_HOSTS), pool_maxsize=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
+
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    GETs a URL over this thread's pooled session, under the host's adaptive throttle.
+
+    Timeouts, connection errors, 429 and 5xx are retried with jittered exponential
+    backoff (see retry.RetryPolicy).  If retries run out, the last response is
+    returned, or the last exception re-raised; 404s are returned straight away.
+
+    When the cache is enabled, previously seen URLs are sent as conditional GETs
+    and a 304 is answered from disk as if it were a normal 200.
+
+    Args:
+        url: Absolute URL to fetch
+        headers: Extra headers merged over DEFAULT_HEADERS
+        timeout: Request timeout in seconds
+
+    Returns:
+        requests.Response
+    """
+    cache = _config["cache"]
+    entry = cache.lookup(url) if cache else None
+    if entry:
+        headers = {**(headers or {}), **cache.conditional_headers(entry)}
+
+    host = urlsplit(url).hostname or ""
+    throttle = _throttle_for(host)
+    policy = _config["retry"]
+    policy.budget.record_request()
+
+    attempt = 1
+    while True:
+        throttle.acquire()
+        start = time.monotonic()
+        response = None
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+        except Exception as exc:
+            throttle.release(None, time.monotonic() - start)
+            if not policy.should_retry(attempt, classify_exception(exc)):
+                raise
+            policy.sleep(attempt)
+            attempt += 1
+            continue
+
+        retry_after = _retry_after_seconds(response)
+        throttle.release(response.status_code, time.monotonic() - start, retry_after)
+        if classify_status(response.status_code) == RETRYABLE and policy.should_retry(attempt, RETRYABLE):
+            policy.sleep(attempt, retry_after)
+            attempt += 1
+            continue
+        break
+
+    if cache:
+        if response.status_code == 304 and entry:
+            return cache.revalidated(entry, response)
+        cache.store(url, response)
+    return response
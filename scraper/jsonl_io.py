@@ -0,0 +1,93 @@
+"""
+JSON Lines helpers for the course catalogue.
+
+Records are written one per line as they are produced and read back one at a
+time, so neither side ever holds the whole catalogue in memory.  Paths ending
+in `.gz` are transparently gzip-compressed.  The legacy single-array
+`master_courses.json` can still be read (but is loaded in one go).
+"""
+
+import gzip
+import json
+import os
+
+# Preferred first: the newest format the scraper writes
+MASTER_COURSES_FILES = ['master_courses.jsonl.gz', 'master_courses.jsonl', 'master_courses.json']
+
+
+def open_text(path, mode='r'):
+    """Opens a UTF-8 text file, gzip-compressed if the path ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_records(path, skip_invalid=False):
+    """
+    Yields records from a .jsonl / .jsonl.gz file one at a time.
+
+    A legacy .json array file is also accepted.
+
+    Args:
+        path: File to read
+        skip_invalid: Ignore lines that are not valid JSON (e.g. a line cut off by a crash)
+    """
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+
+    with open_text(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+
+
+class JsonlWriter:
+    """
+    Writes records to a .jsonl / .jsonl.gz file incrementally.
+
+    Output goes to a temporary file that replaces `path` only when the writer is
+    closed without error, so readers never see a half-written catalogue.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._tmp_path = path + '.tmp'
+        self._file = None
+
+    def __enter__(self):
+        self._file = gzip.open(self._tmp_path, 'wt', encoding='utf-8') if self.path.endswith('.gz') \
+            else open(self._tmp_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+        return False
+
+
+def find_master_courses(data_dir):
+    """
+    Returns the path of the course catalogue in data_dir, or None if there is none.
+
+    Checks MASTER_COURSES_FILES in order, so a fresh .jsonl(.gz) wins over a stale .json.
+    """
+    for name in MASTER_COURSES_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
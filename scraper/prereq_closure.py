@@ -0,0 +1,60 @@
+"""
+Prerequisite edges and their transitive closure.
+
+Each course's `prerequisites_list` becomes (course, prerequisite) edges, and
+the closure lists every direct or indirect prerequisite (ancestor) of each
+course with its depth: the length of the shortest prerequisite chain to it
+(1 = direct prerequisite).  Stored next to the courses, this turns "fetch a
+course and all its prerequisites" into one indexed lookup instead of one
+query per level of the tree.
+"""
+
+from collections import deque
+
+
+def build_prerequisite_edges(records):
+    """
+    Collects prerequisite edges from course records.
+
+    Args:
+        records: Iterable of course records (only 'code' and 'prerequisites_list' are used)
+
+    Returns:
+        Dict of course code -> sorted list of its direct prerequisite codes
+    """
+    edges = {}
+    for record in records:
+        code = record['code']
+        prerequisites = {p for p in record.get('prerequisites_list') or [] if p != code}
+        edges[code] = sorted(prerequisites)
+    return edges
+
+
+def ancestors(edges, code):
+    """
+    Breadth-first walk up the prerequisite graph from one course.
+
+    Cycles (courses listed as each other's prerequisites) are safe: each
+    ancestor is visited once, at its shortest depth.
+
+    Returns:
+        Dict of ancestor code -> depth
+    """
+    depths = {}
+    queue = deque((prereq, 1) for prereq in edges.get(code, ()))
+    while queue:
+        prereq, depth = queue.popleft()
+        if prereq == code or prereq in depths:
+            continue
+        depths[prereq] = depth
+        queue.extend((parent, depth + 1) for parent in edges.get(prereq, ()) if parent not in depths)
+    return depths
+
+
+def transitive_closure(edges):
+    """
+    Yields (course, ancestor, depth) for every course in `edges`, in course order.
+    """
+    for code in sorted(edges):
+        for ancestor, depth in sorted(ancestors(edges, code).items()):
+            yield code, ancestor, depth
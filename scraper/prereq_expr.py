@@ -0,0 +1,243 @@
+"""
+Compiles prerequisite text into a boolean expression tree.
+
+UQ writes prerequisites as free text, e.g.
+
+    (MATH1051 or MATH1071) and (CSSE1001 or ENGG1001)
+    CSSE2002 + CSSE2010; or equivalent
+
+The tree keeps the AND/OR structure that extract_course_codes throws away, in
+a compact JSON-friendly form stored in each course record:
+
+    "CSSE1001"                     a course that must have been passed
+    "equivalent"                   "or equivalent": only satisfied if allowed
+    ["and", expr, expr, ...]       all of the children
+    ["or", expr, expr, ...]        any of the children
+    None                           no course prerequisites
+
+Operator precedence, loosest first: `,` / `;` (AND between clauses, unless
+the next clause starts with "or"), `or`, then `and` / `+` / `&`, with
+parentheses or brackets for grouping.  A bracketed group that starts with
+"or" ("MATH1051 (or equivalent)") is an alternative to the term before it.  Any other
+words ("Completion of", "Permission of Head of School") are skipped, and an
+operator missing an operand is dropped, so messy text still yields the best
+tree the codes allow.
+"""
+
+import re
+
+AND = 'and'
+OR = 'or'
+EQUIVALENT = 'equivalent'
+
+_TOKEN_RE = re.compile(r'[A-Z]{4}\d{4}|[()\[\],;+&]|\b(?:and|or|equivalent)\b', re.IGNORECASE)
+_CODE_RE = re.compile(r'[A-Z]{4}\d{4}$', re.IGNORECASE)
+_OPEN = {'(', '['}
+_CLOSE = {')', ']'}
+_CLAUSE_SEPARATORS = {',', ';'}
+_AND_WORDS = {'and', '+', '&'}
+
+
+def _tokenize(text):
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group(0)
+        tokens.append(token.upper() if _CODE_RE.match(token) else token.lower())
+    return tokens
+
+
+def _combine(op, children):
+    """Builds an op node, flattening nested nodes of the same op and dropping empties/duplicates."""
+    flat = []
+    for child in children:
+        if child is None:
+            continue
+        for item in (child[1:] if isinstance(child, list) and child[0] == op else [child]):
+            if item not in flat:
+                flat.append(item)
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return [op] + flat
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset=0):
+        pos = self.pos + offset
+        return self.tokens[pos] if pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        children = []
+        while self.peek() is not None:
+            children.append(self.clauses())
+            # A stray closing bracket at the top level: skip it and carry on
+            if self.peek() in _CLOSE:
+                self.take()
+        return _combine(AND, children)
+
+    def clauses(self):
+        children = [self.disjunction()]
+        while self.peek() in _CLAUSE_SEPARATORS:
+            self.take()
+            if self.peek() == OR:
+                # "A, B; or equivalent": the clause is an alternative to everything before it
+                self.take()
+                children = [_combine(OR, [_combine(AND, children), self.disjunction()])]
+            else:
+                children.append(self.disjunction())
+        return _combine(AND, children)
+
+    def disjunction(self):
+        children = [self.conjunction()]
+        while self.peek() == OR:
+            self.take()
+            children.append(self.conjunction())
+        return _combine(OR, children)
+
+    def conjunction(self):
+        children = [self.term()]
+        while self.peek() in _AND_WORDS:
+            self.take()
+            children.append(self.term())
+        return _combine(AND, children)
+
+    def term(self):
+        token = self.peek()
+        if token is None or token in _CLOSE or token in _CLAUSE_SEPARATORS \
+                or token == OR or token in _AND_WORDS:
+            return None
+        self.take()
+        if token in _OPEN:
+            node = self.group()
+        else:
+            node = token  # a course code or EQUIVALENT
+        # "MATH1051 (or equivalent)": a bracketed group starting with "or" is an
+        # alternative to the term right before it
+        while self.peek() in _OPEN and self.peek(1) == OR:
+            self.take()
+            self.take()
+            node = _combine(OR, [node, self.group()])
+        return node
+
+    def group(self):
+        """The rest of a bracketed group, after its opening bracket."""
+        inner = self.clauses()
+        if self.peek() in _CLOSE:
+            self.take()
+        return inner
+
+
+def parse_prerequisites(text):
+    """
+    Compiles prerequisite text into an expression tree (see module docstring).
+
+    Returns:
+        The tree, or None if the text names no courses
+    """
+    if not text or text == "N/A":
+        return None
+    tree = _Parser(_tokenize(text)).parse()
+    # "or equivalent" on its own, without any course, is no requirement we can check
+    return None if tree == EQUIVALENT else tree
+
+
+def evaluate(tree, passed, allow_equivalent=False):
+    """
+    True if the courses in `passed` satisfy the expression.
+
+    Args:
+        tree: Expression from parse_prerequisites
+        passed: Set of passed course codes
+        allow_equivalent: Count "or equivalent" alternatives as satisfied
+    """
+    if tree is None:
+        return True
+    if isinstance(tree, str):
+        return allow_equivalent if tree == EQUIVALENT else tree in passed
+    if tree[0] == AND:
+        return all(evaluate(child, passed, allow_equivalent) for child in tree[1:])
+    return any(evaluate(child, passed, allow_equivalent) for child in tree[1:])
+
+
+def _satisfiability(tree, is_unavailable):
+    """True / False, or None when the node only holds "equivalent" (unknown)."""
+    if isinstance(tree, str):
+        return None if tree == EQUIVALENT else not is_unavailable(tree)
+    known = [result for result in (_satisfiability(child, is_unavailable) for child in tree[1:])
+             if result is not None]
+    if not known:
+        return None
+    return all(known) if tree[0] == AND else any(known)
+
+
+def can_still_satisfy(tree, is_unavailable):
+    """
+    False once the expression can no longer be met because of unavailable courses.
+
+    Every course for which is_unavailable(code) is false counts as passable.
+    "equivalent" is unknown: it keeps no OR branch open, so "X or equivalent"
+    is blocked once X is unavailable, and only an expression naming no course
+    at all is never blocked.  client/src/utils/prereqExpr.ts applies the same rule.
+    """
+    if tree is None:
+        return True
+    return _satisfiability(tree, is_unavailable) is not False
+
+
+def compile_expr(tree, allow_equivalent=False):
+    """
+    Turns an expression into a function passed_set -> bool.
+
+    Worth it when the same course is checked against many sets of passed
+    courses: the tree is walked once here, not on every call.
+    """
+    if tree is None:
+        return lambda passed: True
+    if isinstance(tree, str):
+        if tree == EQUIVALENT:
+            return lambda passed: allow_equivalent
+        return lambda passed: tree in passed
+
+    children = tuple(compile_expr(child, allow_equivalent) for child in tree[1:])
+    if tree[0] == AND:
+        return lambda passed: all(child(passed) for child in children)
+    return lambda passed: any(child(passed) for child in children)
+
+
+def expr_codes(tree):
+    """Every course code mentioned in the expression, in order of appearance."""
+    if tree is None:
+        return []
+    if isinstance(tree, str):
+        return [] if tree == EQUIVALENT else [tree]
+    codes = []
+    for child in tree[1:]:
+        codes.extend(code for code in expr_codes(child) if code not in codes)
+    return codes
+
+
+def required_codes(tree):
+    """
+    Codes needed by every way of satisfying the expression.
+
+    An AND needs what each child needs; an OR only what all its branches
+    share, so alternatives drop out of the set.
+    """
+    if tree is None:
+        return set()
+    if isinstance(tree, str):
+        return set() if tree == EQUIVALENT else {tree}
+    child_sets = [required_codes(child) for child in tree[1:]]
+    if tree[0] == AND:
+        return set().union(*child_sets)
+    return set.intersection(*child_sets)
@@ -0,0 +1,186 @@
+"""
+Adaptive per-host throttling for the UQ scrapers.
+
+Each host gets a HostThrottle combining:
+    TokenBucket  - caps the request rate (requests/second, with a small burst)
+    AimdLimiter  - caps concurrent requests; the cap grows additively while
+                   responses are healthy and is cut multiplicatively on 429/5xx,
+                   network errors or a latency spike
+
+so crawls ramp up to whatever the server tolerates and back off on their own
+instead of relying on a hand-picked worker count.
+"""
+
+import threading
+import time
+
+DEFAULT_RATE = 20.0           # requests/second per host
+DEFAULT_BURST = 10
+DEFAULT_INITIAL_CONCURRENCY = 4
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Multiplicative decrease factor on an overload signal
+DECREASE_FACTOR = 0.5
+# A response this many times slower than the average latency counts as overload
+LATENCY_SPIKE_FACTOR = 4.0
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+
+def is_overload_status(status):
+    """429 and 5xx mean the server wants us to slow down; None means the request failed."""
+    return status is None or status == 429 or status >= 500
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `burst`.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Blocks until a token is available, then takes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hands out no tokens for `seconds` (e.g. honouring a Retry-After header)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class AimdLimiter:
+    """
+    Concurrency limit with additive increase / multiplicative decrease.
+
+    Each healthy response adds 1/limit (about +1 per round of `limit` requests);
+    an overload signal multiplies the limit by DECREASE_FACTOR, at most once per
+    average round-trip so a burst of concurrent failures counts as one signal.
+
+    Args:
+        initial: Starting concurrency
+        minimum: Lower bound for the limit
+        maximum: Upper bound for the limit
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL_CONCURRENCY, minimum=1, maximum=DEFAULT_MAX_CONCURRENCY):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self.latency = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def cancel(self):
+        """Gives back a slot that was acquired but never used for a request."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def release(self, status, latency):
+        """
+        Records the outcome of one request and adjusts the limit.
+
+        Args:
+            status: HTTP status code, or None if the request raised
+            latency: Seconds the request took
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            spike = False
+            if status is not None:
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    spike = latency > LATENCY_SPIKE_FACTOR * self.latency
+                    self.latency = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self.latency
+
+            if is_overload_status(status) or spike:
+                if now - self._last_decrease >= (self.latency or 0):
+                    self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+            self._cond.notify_all()
+
+
+class HostThrottle:
+    """
+    Rate + concurrency control for one host.
+
+    Usage:
+        throttle.acquire()
+        ... do the request ...
+        throttle.release(status, latency, retry_after)
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 initial_concurrency=DEFAULT_INITIAL_CONCURRENCY, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AimdLimiter(initial_concurrency, maximum=max_concurrency)
+        self.requests = 0
+        self.overloads = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        self.limiter.acquire()
+        try:
+            self.bucket.acquire()
+        except BaseException:
+            self.limiter.cancel()
+            raise
+
+    def release(self, status, latency, retry_after=None):
+        """
+        Args:
+            status: HTTP status code, or None if the request raised
+            latency: Seconds the request took
+            retry_after: Seconds from a Retry-After header, if the server sent one
+        """
+        with self._lock:
+            self.requests += 1
+            if is_overload_status(status):
+                self.overloads += 1
+        if retry_after:
+            self.bucket.pause(retry_after)
+        self.limiter.release(status, latency)
+
+    def describe(self):
+        summary = (f"concurrency {int(self.limiter.limit)}/{self.limiter.maximum}, "
+                   f"{self.requests} requests, {self.overloads} overload responses")
+        if self.limiter.latency is not None:
+            summary += f", avg latency {self.limiter.latency * 1000:.0f} ms"
+        return summary
@@ -0,0 +1,134 @@
+"""
+Retry policy and failure classification for scraper fetches.
+
+Failures are split into:
+    NOT_FOUND  - 404/410: the page (course, profile, program year) does not exist
+    RETRYABLE  - timeouts, connection errors, 408/425/429 and 5xx: worth trying again
+    FATAL      - any other 4xx or unexpected error: retrying will not help
+
+Retryable failures are retried with jittered exponential backoff, limited both per
+request (max_attempts) and globally (RetryBudget), so a site-wide outage does not
+turn into a retry storm.
+"""
+
+import random
+import threading
+import time
+
+import requests
+
+OK = 'ok'
+NOT_FOUND = 'not_found'
+RETRYABLE = 'retryable'
+FATAL = 'fatal'
+
+RETRYABLE_STATUSES = {408, 425, 429}
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def classify_status(status):
+    """Maps an HTTP status code to OK / NOT_FOUND / RETRYABLE / FATAL."""
+    if 200 <= status < 400:
+        return OK
+    if status in (404, 410):
+        return NOT_FOUND
+    if status in RETRYABLE_STATUSES or status >= 500:
+        return RETRYABLE
+    return FATAL
+
+
+def classify_exception(exc):
+    """Maps an exception raised by a fetch to RETRYABLE or FATAL."""
+    if isinstance(exc, FetchError):
+        return exc.kind
+    if isinstance(exc, RETRYABLE_EXCEPTIONS):
+        return RETRYABLE
+    return FATAL
+
+
+class FetchError(Exception):
+    """
+    A fetch that failed after retries, tagged with its failure class.
+
+    Args:
+        url: URL that failed
+        kind: NOT_FOUND, RETRYABLE or FATAL
+        status: HTTP status code, if a response was received
+    """
+
+    def __init__(self, url, kind, status=None):
+        self.url = url
+        self.kind = kind
+        self.status = status
+        detail = f"status {status}" if status is not None else "no response"
+        super().__init__(f"{kind} failure fetching {url} ({detail})")
+
+    @property
+    def retryable(self):
+        return self.kind == RETRYABLE
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of all requests, shared across threads.
+
+    Every first attempt deposits `ratio` tokens and every retry spends one, with
+    `min_tokens` available up front so early blips can still be retried.
+
+    Args:
+        ratio: Retries allowed per request made (0.2 = at most 20% extra load)
+        min_tokens: Retries allowed regardless of traffic
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=20):
+        self.ratio = ratio
+        self._tokens = float(min_tokens)
+        self._max_tokens = float(min_tokens) * 10
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self):
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff ("full jitter") with a shared retry budget.
+
+    Args:
+        max_attempts: Total attempts per request, including the first
+        base_delay: Backoff before the first retry (seconds, before jitter)
+        max_delay: Upper bound for a single backoff
+        budget: RetryBudget shared by every request using this policy
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0, budget=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def should_retry(self, attempt, kind):
+        """True if a failure of class `kind` on attempt `attempt` should be retried."""
+        return kind == RETRYABLE and attempt < self.max_attempts and self.budget.try_spend()
+
+    def sleep(self, attempt, retry_after=None):
+        time.sleep(self.backoff(attempt, retry_after))
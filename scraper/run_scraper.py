@@ -1,82 +1,136 @@
+import http_client
 import requests
 from bs4 import BeautifulSoup
 import json
 import re
 import time
-import concurrent.futures
 import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from tqdm import tqdm
+from async_crawler import CourseCrawler
+from catalogue_db import CatalogueDB
+from checkpoint import CrawlCheckpoint
+from course_delta import DeltaTracker
+from course_graph import CourseGraph, write_condensation
+from static_bundles import build_bundles
+from search_index import build_search_index
+from jsonl_io import JsonlWriter, iter_records
+from course_parser import extract_course_sections
+from prereq_expr import parse_prerequisites
+from retry import FATAL, NOT_FOUND, OK, FetchError, classify_exception, classify_status
+
+# Crawl output: JSON Lines, gzip-compressed because of the .gz suffix
+OUTPUT_FILENAME = 'master_courses.jsonl.gz'
+
+# Max simultaneous requests to any one UQ host (the same budget run_all_scrapers gives the faculty scrapers)
+REQUEST_BUDGET = 8
+# The crawl talks to two hosts at once: course pages and course profiles.  More
+# requests in flight than their budgets allow would only park threads in the throttle.
+MAX_IN_FLIGHT = REQUEST_BUDGET * 2
+
+# Courses that failed transiently get a second pass after this cool-down, with fewer requests in flight
+RETRY_PASS_COOLDOWN = 30
+RETRY_PASS_MAX_IN_FLIGHT = REQUEST_BUDGET
 
 # --- 1. CORE SCRAPER FUNCTIONS ---
 
 def extract_course_codes(text):
     return re.findall(r'[A-Z]{4}\d{4}', text)
 
-def scrape_uq_course(course_code):
-    url = f"https://my.uq.edu.au/programs-courses/course.html?course_code={course_code}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    
+COURSE_URL = "https://my.uq.edu.au/programs-courses/course.html?course_code={course_code}"
+
+def parse_course_page(course_code, html, backend=None):
+    """
+    Builds a course record from a course page's HTML.
+
+    All `course-*` sections are pulled out in a single pass by course_parser;
+    `backend` picks the parser ('lxml' or 'bs4', default: course_parser.DEFAULT_BACKEND).
+    """
+    page = extract_course_sections(html, backend=backend)
+
+    def get_text(selector_id):
+        return page['text'].get(selector_id, "N/A")
+
+    full_title = get_text('course-title')
+    course_name = re.sub(r'\s\([A-Z]{4}\d{4}\)', '', full_title)
+
+    level = get_text('course-level')
+    faculty = get_text('course-faculty')
+    school = get_text('course-school')
+    units_text = get_text('course-units')
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        def get_text(selector_id):
-            element = soup.find(id=selector_id)
-            return element.get_text(strip=True) if element else "N/A"
+         units = int(units_text) if units_text != "N/A" else 0
+    except:
+         units = 0
 
-        full_title = get_text('course-title')
-        course_name = re.sub(r'\s\([A-Z]{4}\d{4}\)', '', full_title)
+    contact_hours = page['spaced_text'].get('course-contact', "N/A")
 
-        level = get_text('course-level')
-        faculty = get_text('course-faculty')
-        school = get_text('course-school')
-        units_text = get_text('course-units')
-        try:
-             units = int(units_text) if units_text != "N/A" else 0
-        except:
-             units = 0
+    prereq_raw = get_text('course-prerequisite')
+    incomp_raw = get_text('course-incompatible')
 
-        duration = get_text('course-duration')
-        mode = get_text('course-mode')
-        contact_hours = soup.find(id='course-contact').get_text(separator=' ', strip=True) if soup.find(id='course-contact') else "N/A"        
-        
-        prereq_raw = get_text('course-prerequisite')
-        incomp_raw = get_text('course-incompatible')
-        
-        description = get_text('course-summary')
-        assessment_summary = get_text('course-assessment-methods')
-        coordinator = get_text('course-coordinator')
-
-        ecp_link = ""
-        ecp_tag = soup.find('a', class_='profile-available')
-        if ecp_tag:
-            ecp_link = ecp_tag['href']
-            if ecp_link.startswith('/'):
-                ecp_link = "https://programs-courses.uq.edu.au" + ecp_link
-
-        return {
-            "code": course_code,
-            "title": course_name,
-            "units": units,
-            "level": level,
-            "faculty": faculty,
-            "school": school,
-            "description": description,
-            "contact_hours": contact_hours,
-            "assessment_summary": assessment_summary,
-            "prerequisites_text": prereq_raw,
-            "prerequisites_list": extract_course_codes(prereq_raw),
-            "incompatible_list": extract_course_codes(incomp_raw),
-            "coordinator": coordinator,
-            "ecp_link": ecp_link,
-            "url": url
-        }
-    except Exception as e:
-        print(f"Error scraping {course_code}: {e}")
+    description = get_text('course-summary')
+    assessment_summary = get_text('course-assessment-methods')
+    coordinator = get_text('course-coordinator')
+
+    ecp_link = page['ecp_href'] or ""
+    if ecp_link.startswith('/'):
+        ecp_link = "https://programs-courses.uq.edu.au" + ecp_link
+
+    return {
+        "code": course_code,
+        "title": course_name,
+        "units": units,
+        "level": level,
+        "faculty": faculty,
+        "school": school,
+        "description": description,
+        "contact_hours": contact_hours,
+        "assessment_summary": assessment_summary,
+        "prerequisites_text": prereq_raw,
+        "prerequisites_list": extract_course_codes(prereq_raw),
+        # AND/OR structure of the prerequisites (see prereq_expr)
+        "prerequisites_expr": parse_prerequisites(prereq_raw),
+        "incompatible_list": extract_course_codes(incomp_raw),
+        "coordinator": coordinator,
+        "ecp_link": ecp_link,
+        "url": COURSE_URL.format(course_code=course_code)
+    }
+
+def fetch_page(url, headers=None):
+    """
+    Fetches a page, turning failures into FetchError with their failure class.
+
+    http_client has already retried transient failures by the time this raises.
+
+    Returns:
+        requests.Response for a 200, or None if the page does not exist (404/410)
+    """
+    try:
+        response = http_client.get(url, headers=headers)
+    except requests.exceptions.RequestException as e:
+        raise FetchError(url, classify_exception(e)) from e
+
+    kind = classify_status(response.status_code)
+    if kind == NOT_FOUND:
         return None
+    if response.status_code != 200:
+        raise FetchError(url, kind if kind != OK else FATAL, response.status_code)
+    return response
+
+def scrape_uq_course(course_code):
+    """
+    Returns the course record, or None if UQ has no page for the course.
+
+    Raises FetchError when the page could not be fetched; `.retryable` says whether
+    trying again later might help.
+    """
+    url = COURSE_URL.format(course_code=course_code)
+    headers = {"User-Agent": "Mozilla/5.0"}
+
+    response = fetch_page(url, headers=headers)
+    if response is None:
+        return None
+    return parse_course_page(course_code, response.text)
 
 def clean_assessment_task(raw_name):
     flags = {
@@ -105,13 +159,36 @@ def clean_assessment_task(raw_name):
     
     return clean_name, flags
 
+def normalise_profile_url(ecp_url):
+    """
+    Canonical form of a course profile URL, so links to the same profile compare equal.
+
+    Lowercases the scheme and host, upgrades http to https, sorts the query
+    string and drops the fragment and any trailing slash.
+    """
+    parts = urlsplit(ecp_url.strip())
+    scheme = 'https' if parts.scheme.lower() in ('http', 'https', '') else parts.scheme.lower()
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, parts.netloc.lower(), parts.path.rstrip('/') or '/', query, ''))
+
 def scrape_assessment_table(ecp_url):
     if not ecp_url or ecp_url == "N/A":
         return []
     
     headers = {"User-Agent": "Mozilla/5.0"}
+    # A missing or unfetchable profile just means no assessments (the course itself
+    # is still kept); only transient failures propagate, so the course is retried
+    try:
+        response = fetch_page(ecp_url, headers=headers)
+    except FetchError as e:
+        if e.retryable:
+            raise
+        print(f"Skipping assessment table at {ecp_url}: {e}")
+        return []
+    if response is None:
+        return []
+
     try:
-        response = requests.get(ecp_url, headers=headers)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         assessments = []
@@ -153,23 +230,13 @@ def scrape_assessment_table(ecp_url):
         print(f"Error scraping assessment table at {ecp_url}: {e}")
         return []
 
-def get_full_course_data(course_code):
-    course_code = course_code.upper()
-    course_data = scrape_uq_course(course_code)
-    
-    if course_data and course_data['ecp_link']:
-        # print(f"--- Drilling down into ECP for {course_code} ---")
-        course_data['assessments'] = scrape_assessment_table(course_data['ecp_link'])
-        
-    return course_data
-
 # --- 2. EXECUTION ---
 
 def main():
     # Paths (Assuming running from 'scraper' dir or project root)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     input_path = os.path.join(script_dir, '..', 'data', 'course_codes_only.json')
-    output_path = os.path.join(script_dir, '..', 'data', 'master_courses.json')
+    output_path = os.path.join(script_dir, '..', 'data', OUTPUT_FILENAME)
 
     try:
         with open(input_path, 'r', encoding='utf-8') as f:
@@ -185,32 +252,107 @@ def main():
         print(f"❌ Error reading input file: {e}")
         return
 
-    MAX_WORKERS = 5
-    results = []
+    # MAX_IN_FLIGHT is a ceiling; http_client's per-host throttle adapts the real
+    # concurrency below REQUEST_BUDGET from latency and 429/5xx rates
+    http_client.configure(max_workers=MAX_IN_FLIGHT, per_host_limit=REQUEST_BUDGET)
+    http_client.enable_cache(http_client.DEFAULT_CACHE_DIR)
     failed_courses = []
 
-    print(f"🚀 Starting scrape with {MAX_WORKERS} threads...")
+    # Resume from the checkpoint of an interrupted run, if there is one.
+    # Finished records live only in the checkpoint log, never in memory.
+    checkpoint = CrawlCheckpoint()
+    db = CatalogueDB()
+    completed = checkpoint.codes()
+    remaining = [code for code in course_list if code.upper() not in completed]
+    if completed:
+        print(f"♻️ Resuming: {len(completed)} courses already in checkpoint, {len(remaining)} to go.")
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_code = {executor.submit(get_full_course_data, code): code for code in course_list}
-        
-        for future in tqdm(concurrent.futures.as_completed(future_to_code), total=len(course_list), desc="Downloading"):
-            code = future_to_code[future]
-            try:
-                data = future.result()
-                if data:
-                    results.append(data)
-                else:
-                    failed_courses.append(code)
-            except Exception as exc:
-                print(f"⚠️ {code} generated an exception: {exc}")
+    not_found_courses = []
+    retryable_courses = []
+
+    def crawl(codes, max_in_flight, desc):
+        progress = tqdm(total=len(codes), desc=desc)
+
+        def on_result(code, data, error):
+            if data:
+                checkpoint.append(data)
+                db.upsert_course(data)
+            elif error is None:
+                not_found_courses.append(code)
+            elif isinstance(error, FetchError) and error.retryable:
+                retryable_courses.append(code)
+            else:
+                tqdm.write(f"⚠️ {code} failed: {error}")
                 failed_courses.append(code)
+            progress.update(1)
+
+        crawler = CourseCrawler(scrape_uq_course, scrape_assessment_table, max_in_flight=max_in_flight,
+                                profile_key=normalise_profile_url)
+        try:
+            crawler.run(codes, on_result)
+        finally:
+            progress.close()
+        if crawler.profile_reuses:
+            print(f"📎 {crawler.profile_fetches} course profiles fetched, "
+                  f"{crawler.profile_reuses} shared with cross-listed courses")
+
+    print(f"🚀 Starting async scrape with up to {MAX_IN_FLIGHT} requests in flight...")
+
+    try:
+        crawl(remaining, MAX_IN_FLIGHT, "Downloading")
+
+        # Transient failures (timeouts, 429, 5xx) get one more pass once the site has had a breather
+        if retryable_courses:
+            retry_codes = list(retryable_courses)
+            retryable_courses.clear()
+            print(f"🔁 {len(retry_codes)} courses failed transiently; retrying in {RETRY_PASS_COOLDOWN}s "
+                  f"with up to {RETRY_PASS_MAX_IN_FLIGHT} requests in flight...")
+            time.sleep(RETRY_PASS_COOLDOWN)
+            crawl(retry_codes, RETRY_PASS_MAX_IN_FLIGHT, "Retrying")
+    finally:
+        checkpoint.close()
+
+    failed_courses.extend(retryable_courses)
+
+    # Stream the checkpoint into the final catalogue, one record at a time,
+    # hashing each record to find what changed since the last crawl
+    delta = DeltaTracker()
+    seen_codes = set()
+    with JsonlWriter(output_path) as writer:
+        for record in checkpoint.iter_records():
+            if record['code'] not in seen_codes:
+                seen_codes.add(record['code'])
+                writer.write(record)
+                delta.observe(record)
+
+    # Courses that failed to fetch are not treated as removed
+    changes = delta.finish(keep_codes=failed_courses)
+    db.delete_courses(delta.removed_codes)
+    db.close()
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=4)
+    # The full output is on disk, so the next run starts a fresh crawl
+    checkpoint.remove()
         
-    print(f"✅ Completed! Scraped {len(results)} courses. (Failed: {len(failed_courses)})")
+    for line in http_client.throttle_report():
+        print(f"📶 {line}")
+    print(f"✅ Completed! Scraped {writer.count} courses. "
+          f"(Not found: {len(not_found_courses)}, Failed: {len(failed_courses)})")
+    if failed_courses:
+        print(f"⚠️ Failed courses: {', '.join(sorted(failed_courses))}")
     print(f"✅ Saved to: {output_path}")
+    # Find prerequisite cycles once here, so the client and planners get an acyclic graph
+    condensed = write_condensation(CourseGraph.from_records(iter_records(output_path)))
+    print(f"🔁 Prerequisite cycles: {len(condensed['cycles'])}")
+    for cycle in condensed['cycles']:
+        print(f"   - {' -> '.join(cycle)}")
+    # Static per-course bundles for the client (unchanged ones are left alone)
+    bundles = build_bundles(output_path)
+    print(f"📦 Client bundles: {bundles.written} written, {bundles.unchanged} unchanged, {bundles.removed} removed")
+    # Typeahead index: full one for the Python API, codes + titles for the client
+    index = build_search_index(output_path)
+    print(f"🔎 Search index: {len(index.codes)} courses")
+    print(f"🧮 Change set: {changes['added']} added, {changes['modified']} modified, "
+          f"{changes['removed']} removed -> {delta.changes_path}")
 
 if __name__ == "__main__":
     main()
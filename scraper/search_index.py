@@ -0,0 +1,310 @@
+"""
+Prebuilt search index for course code / title typeahead.
+
+Built from the course catalogue, it answers a query without touching the
+database:
+
+    codes      course codes in sorted order; a code prefix ("CSSE1") is a
+               binary-searched range of this array, which is what a prefix
+               trie over the codes gives, at a fraction of the size
+    titles     trigram -> sorted course ids, over the words of each title
+    text       the same over descriptions (Python index only; too large to ship)
+
+Text queries look up the trigrams of the query words.  The last word may be
+half typed, so it only needs to prefix a word.  Candidates come from the
+rarest trigrams; each remaining trigram is then checked per candidate by
+binary search when that is cheaper than reading its posting list, so a
+common trigram costs little once the rare ones have narrowed the candidates.
+
+Results are ranked exact code, then code prefix, then title match, then
+description match.
+
+The pipeline writes the full index to data/search_index.json.gz and a
+code+title index to client/public/data/search_index.json(.gz) for the client;
+the client copy is committed, since the client build cannot generate it.
+
+Usage:
+    python search_index.py build
+    python search_index.py query "machine learn"
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from jsonl_io import find_master_courses, iter_records
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(script_dir, '..', 'data')
+DEFAULT_INDEX_PATH = os.path.join(DATA_DIR, 'search_index.json.gz')
+DEFAULT_CLIENT_INDEX_PATH = os.path.join(script_dir, '..', 'client', 'public', 'data', 'search_index.json')
+
+INDEX_VERSION = 1
+DEFAULT_LIMIT = 10
+# Share of the query's trigrams a course must contain to match
+MIN_GRAM_MATCH = 0.75
+# Cost of one Python binary-search step relative to reading one posting in C
+BISECT_STEP_COST = 4
+
+_CODE_QUERY_RE = re.compile(r'^[A-Z]{1,4}\d{0,4}$')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+EXACT_CODE, CODE_PREFIX, TITLE, TEXT = 3, 2, 1, 0
+
+
+def normalise_words(text):
+    """Lower-case ASCII words of a text (accents stripped)."""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
+    return _WORD_RE.findall(text.lower())
+
+
+def word_grams(word, partial=False):
+    """
+    Trigrams of one word, padded so short words and word starts count.
+
+    "data" -> " da", "dat", "ata", "ta " (no trailing " ta " gram if partial,
+    since a half-typed word may continue).
+    """
+    padded = f" {word}" if partial else f" {word} "
+    if len(padded) < 3:
+        return {padded}
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def text_grams(text):
+    grams = set()
+    for word in normalise_words(text):
+        grams |= word_grams(word)
+    return grams
+
+
+def query_grams(query):
+    words = normalise_words(query)
+    grams = set()
+    for position, word in enumerate(words):
+        grams |= word_grams(word, partial=position == len(words) - 1)
+    return grams
+
+
+def _invert(docs_grams):
+    postings = {}
+    for doc_id, grams in enumerate(docs_grams):
+        for gram in grams:
+            postings.setdefault(gram, array('i')).append(doc_id)
+    return postings
+
+
+def _encode_postings(postings):
+    """Gap-encodes posting lists (sorted ids -> first id, then differences) for compact JSON."""
+    encoded = {}
+    for gram, ids in postings.items():
+        previous = 0
+        gaps = []
+        for doc_id in ids:
+            gaps.append(doc_id - previous)
+            previous = doc_id
+        encoded[gram] = gaps
+    return encoded
+
+
+def _contains(posting, doc_id):
+    """Binary search for doc_id in a sorted posting list."""
+    i = bisect_left(posting, doc_id)
+    return i < len(posting) and posting[i] == doc_id
+
+
+def _decode_postings(encoded):
+    postings = {}
+    for gram, gaps in encoded.items():
+        ids = array('i')
+        total = 0
+        for gap in gaps:
+            total += gap
+            ids.append(total)
+        postings[gram] = ids
+    return postings
+
+
+class SearchIndex:
+    """
+    In-memory course search index.
+
+    Build with SearchIndex.build(records), or SearchIndex.load(path) for a saved one.
+    """
+
+    def __init__(self, codes, titles, title_postings, text_postings):
+        self.codes = codes
+        self.titles = titles
+        self.title_postings = title_postings
+        self.text_postings = text_postings
+
+    @classmethod
+    def build(cls, records):
+        docs = sorted(((r['code'], r.get('title') or '', r.get('description') or '') for r in records))
+        codes = [code for code, _, _ in docs]
+        titles = [title for _, title, _ in docs]
+        title_postings = _invert(text_grams(title) for _, title, _ in docs)
+        text_postings = _invert(text_grams(description) for _, _, description in docs)
+        return cls(codes, titles, title_postings, text_postings)
+
+    # --- Persistence ---
+
+    def to_dict(self, include_text=True):
+        data = {
+            'version': INDEX_VERSION,
+            'codes': self.codes,
+            'titles': self.titles,
+            'title_grams': _encode_postings(self.title_postings)
+        }
+        if include_text:
+            data['text_grams'] = _encode_postings(self.text_postings)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+        return cls(data['codes'], data['titles'], _decode_postings(data['title_grams']),
+                   _decode_postings(data.get('text_grams', {})))
+
+    def save(self, path, include_text=True):
+        """Writes the index as JSON (gzip-compressed if path ends in .gz), atomically."""
+        body = json.dumps(self.to_dict(include_text), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(body, mtime=0) if path.endswith('.gz') else body)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    # --- Queries ---
+
+    def code_prefix_range(self, prefix):
+        """(start, end) ids of the codes starting with `prefix`."""
+        start = bisect_left(self.codes, prefix)
+        end = bisect_left(self.codes, prefix + '\x7f', lo=start)
+        return start, end
+
+    def _gram_matches(self, postings, grams):
+        """
+        Doc id -> number of query trigrams it contains, for docs with at least MIN_GRAM_MATCH of them.
+
+        A doc with `needed` of the grams must contain one of the rarest
+        len - needed + 1, so only those posting lists are scanned in full and
+        give the candidates.  Each remaining list costs
+        min(candidates * log(posting), posting): a binary search per candidate,
+        or one pass over the list when that is cheaper.  The scan stops as soon
+        as no candidate can still reach `needed`.
+        """
+        lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+        needed = max(1, int(len(grams) * MIN_GRAM_MATCH + 0.999))
+        split = len(lists) - needed + 1
+        counts = Counter()
+        for posting in lists[:split]:
+            counts.update(posting)
+        candidates = set(counts)
+        # Upper bound on any candidate's count so far
+        best = max(counts.values(), default=0)
+
+        for position in range(split, len(lists)):
+            if best + len(lists) - position < needed:
+                return {}
+            posting = lists[position]
+            if len(candidates) * len(posting).bit_length() * BISECT_STEP_COST < len(posting):
+                hits = [doc_id for doc_id in candidates if _contains(posting, doc_id)]
+            else:
+                hits = candidates.intersection(posting)
+            if hits:
+                best += 1
+                counts.update(hits)
+        return {doc_id: count for doc_id, count in counts.items() if count >= needed}
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Ranked matches for a typeahead query.
+
+        Returns:
+            List of {'code', 'title', 'score'}; score is (match kind, strength),
+            higher is better
+        """
+        query = (query or '').strip()
+        if not query:
+            return []
+
+        scores = {}
+        compact = query.replace(' ', '').upper()
+        if _CODE_QUERY_RE.match(compact):
+            start, end = self.code_prefix_range(compact)
+            # Ids are in code order, so the first `limit` codes are the best code matches
+            for doc_id in range(start, min(end, start + limit)):
+                kind = EXACT_CODE if self.codes[doc_id] == compact else CODE_PREFIX
+                scores[doc_id] = (kind, 0.0)
+
+        grams = query_grams(query)
+        if grams:
+            for doc_id, count in self._gram_matches(self.title_postings, grams).items():
+                scores.setdefault(doc_id, (TITLE, count / len(grams)))
+            if len(scores) < limit and self.text_postings:
+                for doc_id, count in self._gram_matches(self.text_postings, grams).items():
+                    scores.setdefault(doc_id, (TEXT, count / len(grams)))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], -item[1][1], self.codes[item[0]]))
+        return [{'code': self.codes[doc_id], 'title': self.titles[doc_id], 'score': score}
+                for doc_id, score in ranked[:limit]]
+
+
+def build_search_index(catalogue_path, index_path=DEFAULT_INDEX_PATH, client_path=DEFAULT_CLIENT_INDEX_PATH):
+    """
+    Builds the index from a catalogue and writes the full and client artifacts.
+
+    The client artifact (codes + titles only) is written plain and as .gz.
+    """
+    index = SearchIndex.build(iter_records(catalogue_path))
+    index.save(index_path)
+    if client_path:
+        os.makedirs(os.path.dirname(client_path), exist_ok=True)
+        index.save(client_path, include_text=False)
+        index.save(client_path + '.gz', include_text=False)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the course search index")
+    parser.add_argument('command', choices=['build', 'query'])
+    parser.add_argument('query', nargs='?', default='')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        catalogue_path = find_master_courses(DATA_DIR)
+        if not catalogue_path:
+            print(f"❌ Error: No master_courses catalogue found in '{DATA_DIR}'")
+            return
+        index = build_search_index(catalogue_path)
+        print(f"🔎 Indexed {len(index.codes)} courses ({len(index.title_postings)} title trigrams, "
+              f"{len(index.text_postings)} description trigrams)")
+        print(f"✅ Saved to: {DEFAULT_INDEX_PATH} and {DEFAULT_CLIENT_INDEX_PATH}")
+        return
+
+    index = SearchIndex.load()
+    start = time.perf_counter()
+    results = index.search(args.query, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for result in results:
+        print(f"{result['code']}  {result['title']}")
+    print(f"({len(results)} results in {elapsed:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Builds static, CDN-cacheable JSON bundles for the client.
+
+For every course one file holds what the course page reads: the course
+record and its assessments.  File names carry a hash of the content, e.g.
+
+    courses/CSSE1001.3f9a1c2b7d40.json
+
+so they can be served with `Cache-Control: immutable`.  manifest.json (not
+hashed, short cache) maps course codes to their current files.  Each bundle
+is also written pre-compressed as .gz and, when the optional `brotli` package
+is installed, .br.
+
+Bundles whose content did not change keep their file name and are not
+rewritten; files no longer in the manifest are deleted.  The bundles are
+committed with the crawl output, since the client build has no catalogue to
+generate them from.
+
+Usage:
+    python static_bundles.py [--out DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from jsonl_io import find_master_courses, iter_records
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(script_dir, '..', 'data')
+DEFAULT_BUNDLE_DIR = os.path.join(script_dir, '..', 'client', 'public', 'data', 'bundles')
+MANIFEST_NAME = 'manifest.json'
+
+# Hex digits of the content hash kept in file names
+HASH_LENGTH = 12
+
+
+def _encode(payload):
+    """Deterministic compact JSON, so identical content always hashes the same."""
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+class BundleWriter:
+    """
+    Writes content-hashed bundles (plus .gz/.br variants) under one directory.
+
+    Args:
+        out_dir: Bundle root directory
+    """
+
+    def __init__(self, out_dir=DEFAULT_BUNDLE_DIR):
+        self.out_dir = out_dir
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self._kept = set()
+
+    def write(self, subdir, stem, payload):
+        """
+        Writes one bundle unless an identical one already exists.
+
+        Returns:
+            Path of the bundle relative to out_dir (what the manifest records)
+        """
+        body = _encode(payload)
+        digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        rel_path = f"{subdir}/{stem}.{digest}.json"
+        path = os.path.join(self.out_dir, rel_path)
+
+        variants = {path: body, path + '.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli:
+            variants[path + '.br'] = brotli.compress(body)
+
+        if all(os.path.exists(p) for p in variants):
+            self.unchanged += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for variant_path, data in variants.items():
+                tmp_path = variant_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, variant_path)
+            self.written += 1
+
+        self._kept.update(os.path.normpath(p) for p in variants)
+        return rel_path
+
+    def write_manifest(self, manifest):
+        body = _encode(manifest)
+        os.makedirs(self.out_dir, exist_ok=True)
+        for name, data in ((MANIFEST_NAME, body), (MANIFEST_NAME + '.gz', gzip.compress(body, mtime=0))):
+            tmp_path = os.path.join(self.out_dir, name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.out_dir, name))
+
+    def prune(self, subdirs):
+        """Deletes bundles in `subdirs` that were not written or kept in this run."""
+        removed = 0
+        for subdir in subdirs:
+            directory = os.path.join(self.out_dir, subdir)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.normpath(os.path.join(directory, name))
+                if path not in self._kept:
+                    os.remove(path)
+                    removed += 1
+        self.removed += removed
+        return removed
+
+
+def build_bundles(catalogue_path, out_dir=DEFAULT_BUNDLE_DIR):
+    """
+    Writes every course bundle plus the manifest.
+
+    Args:
+        catalogue_path: master_courses catalogue to read
+        out_dir: Bundle root directory
+
+    Returns:
+        The BundleWriter (for its written / unchanged counts)
+    """
+    writer = BundleWriter(out_dir)
+    manifest = {'courses': {}}
+
+    for record in iter_records(catalogue_path):
+        code = record['code']
+        manifest['courses'][code] = writer.write('courses', code, {
+            'course': {key: value for key, value in record.items() if key != 'assessments'},
+            'assessments': record.get('assessments', [])
+        })
+
+    writer.write_manifest(manifest)
+    writer.prune(['courses'])
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build static course bundles for the client")
+    parser.add_argument('--out', default=DEFAULT_BUNDLE_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    catalogue_path = find_master_courses(DATA_DIR)
+    if not catalogue_path:
+        print(f"❌ Error: No master_courses catalogue found in '{DATA_DIR}'")
+        return
+
+    writer = build_bundles(catalogue_path, args.out)
+    print(f"📦 Bundles: {writer.written} written, {writer.unchanged} unchanged, {writer.removed} removed")
+    if brotli is None:
+        print("💡 Install 'brotli' to also write .br variants")
+    print(f"✅ Saved to: {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+from course_delta import REMOVED, DeltaTracker, iter_changes, load_failed_codes, record_hash, save_hashes
+
+
+def test_failed_codes_are_kept_and_recorded(tmp_path):
+    hashes_path, changes_path, failed_path = (str(tmp_path / name) for name in ('h.json', 'c.jsonl', 'f.json'))
+    records = {code: {'code': code} for code in ('AAAA1000', 'BBBB1000', 'CCCC1000')}
+    save_hashes({code: record_hash(record) for code, record in records.items()}, hashes_path)
+
+    tracker = DeltaTracker(hashes_path, changes_path, failed_path)
+    tracker.observe(records['AAAA1000'])
+    tracker.finish(keep_codes=['bbbb1000', 'AAAA1000'])
+
+    assert tracker.removed_codes == ['CCCC1000']
+    assert [change['code'] for change in iter_changes(changes_path) if change['change'] == REMOVED] == ['CCCC1000']
+    assert load_failed_codes(failed_path) == {'BBBB1000'}
+
+
+def test_clean_crawl_clears_failed_codes(tmp_path):
+    failed_path = str(tmp_path / 'f.json')
+    tracker = DeltaTracker(str(tmp_path / 'h.json'), str(tmp_path / 'c.jsonl'), failed_path)
+    tracker.finish(keep_codes=['AAAA1000'])
+    assert load_failed_codes(failed_path) == {'AAAA1000'}
+
+    DeltaTracker(str(tmp_path / 'h.json'), str(tmp_path / 'c.jsonl'), failed_path).finish()
+    assert load_failed_codes(failed_path) == set()
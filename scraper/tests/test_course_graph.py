@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from course_graph import CourseGraph
+from prereq_expr import can_still_satisfy, expr_codes, parse_prerequisites
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+CLIENT_EXPR_PATH = os.path.join(REPO_DIR, 'client', 'src', 'utils', 'prereqExpr.ts')
+CLIENT_TYPESCRIPT = os.path.join(REPO_DIR, 'client', 'node_modules', 'typescript')
+
+PREREQUISITES = {
+    'BBBB1000': "AAAA1000 or equivalent",
+    'CCCC1000': "AAAA1000 (or equivalent)",
+    'DDDD1000': "AAAA1000 or EEEE1000",
+    'FFFF1000': "(AAAA1000 or EEEE1000) and GGGG1000",
+    'HHHH1000': "BBBB1000 and GGGG1000",
+    'JJJJ1000': "AAAA1000 and GGGG1000; or equivalent",
+    'KKKK1000': "Permission of Head of School",
+}
+FAILED = ['AAAA1000']
+
+
+def make_graph():
+    records = []
+    for code, text in PREREQUISITES.items():
+        expr = parse_prerequisites(text)
+        records.append({'code': code, 'units': 2, 'prerequisites_expr': expr, 'prerequisites_list': expr_codes(expr)})
+    records += [{'code': code, 'units': 2} for code in ('AAAA1000', 'EEEE1000', 'GGGG1000')]
+    return CourseGraph.from_records(records)
+
+
+def test_blocked_treats_equivalent_as_unknown():
+    assert make_graph().blocked(FAILED) == {'BBBB1000', 'CCCC1000', 'HHHH1000', 'JJJJ1000'}
+
+
+def _client_can_still_satisfy(cases):
+    """Runs client/src/utils/prereqExpr.ts on [(expr, unavailable codes)] with the client's TypeScript."""
+    script = """
+const fs = require('fs');
+const ts = require(process.argv[1]);
+const source = fs.readFileSync(process.argv[2], 'utf8');
+const js = ts.transpileModule(source, { compilerOptions: { module: ts.ModuleKind.CommonJS } }).outputText;
+const mod = { exports: {} };
+new Function('module', 'exports', 'require', js)(mod, mod.exports, require);
+const cases = JSON.parse(fs.readFileSync(0, 'utf8'));
+console.log(JSON.stringify(cases.map(([expr, unavailable]) =>
+  mod.exports.canStillSatisfy(expr, (code) => unavailable.includes(code)))));
+"""
+    result = subprocess.run(['node', '-e', script, CLIENT_TYPESCRIPT, CLIENT_EXPR_PATH],
+                            input=json.dumps(cases), capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which('node') is None or not os.path.isdir(CLIENT_TYPESCRIPT),
+                    reason="needs node and the client's dev dependencies (npm install in client/)")
+def test_client_and_graph_agree_on_blocked_courses():
+    graph = make_graph()
+    unavailable = FAILED + sorted(graph.blocked(FAILED))
+    exprs = {code: parse_prerequisites(text) for code, text in PREREQUISITES.items()}
+    codes = [code for code, expr in exprs.items() if expr is not None]
+
+    client = _client_can_still_satisfy([[exprs[code], unavailable] for code in codes])
+    python = [can_still_satisfy(exprs[code], lambda c: c in unavailable) for code in codes]
+    graph_open = [code not in graph.blocked(FAILED) for code in codes]
+    assert client == python == graph_open
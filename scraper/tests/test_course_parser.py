@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from benchmark_parser import FIXTURE_DIR, legacy_parse_course_page
+from course_parser import BACKENDS, lxml
+from run_scraper import parse_course_page
+
+BACKENDS_AVAILABLE = [backend for backend in BACKENDS if backend != 'lxml' or lxml is not None]
+
+SAMPLE_PAGE = """<html><body>
+<h1 id="course-title">Intro to Testing (TEST1000)</h1>
+<p id="course-units">2</p>
+<div id="course-summary">First <b>line</b><!-- note -->&nbsp;and <script>var x;</script>more.</div>
+<p id="course-contact">2L<br>1T</p>
+<p id="course-prerequisite">TEST0999 or equivalent</p>
+<p id="course-incompatible">TEST2000</p>
+<a class="btn profile-available" href="/course-profiles/TEST1000-1">Profile</a>
+</body></html>"""
+
+
+def fixture_pages():
+    if not os.path.isdir(FIXTURE_DIR):
+        return []
+    return sorted(name for name in os.listdir(FIXTURE_DIR) if name.endswith('.html'))
+
+
+@pytest.mark.parametrize('backend', BACKENDS_AVAILABLE)
+def test_backend_matches_legacy_parser_on_sample(backend):
+    assert parse_course_page('TEST1000', SAMPLE_PAGE, backend=backend) == legacy_parse_course_page('TEST1000', SAMPLE_PAGE)
+
+
+@pytest.mark.skipif(not fixture_pages(), reason="no saved course pages (python benchmark_parser.py --fetch 50)")
+@pytest.mark.parametrize('backend', BACKENDS_AVAILABLE)
+@pytest.mark.parametrize('name', fixture_pages() or [None])
+def test_backend_matches_legacy_parser_on_fixtures(backend, name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        html = f.read()
+    code = name[:-len('.html')]
+    assert parse_course_page(code, html, backend=backend) == legacy_parse_course_page(code, html)
@@ -0,0 +1,49 @@
+import time
+
+import faculty_scraper
+from faculty_scraper import YearHints, scrape_program_courses_json
+
+YEARS = [2026, 2025, 2024]
+PROGRAM = {'name': 'Bachelor of Testing', 'program_id': 2000}
+
+
+def scrape(monkeypatch, hints, valid_years):
+    probed = []
+
+    def scrape_program_year(program_id, year):
+        probed.append(year)
+        return (['AAAA1000'], 16) if year in valid_years else None
+
+    monkeypatch.setattr(faculty_scraper, 'scrape_program_year', scrape_program_year)
+    scrape_program_courses_json(PROGRAM, YEARS, hints)
+    return sorted(probed, reverse=True)
+
+
+def test_trusted_hint_is_probed_alone(monkeypatch, tmp_path):
+    hints = YearHints(str(tmp_path / 'hints.json'))
+    assert 2026 in scrape(monkeypatch, hints, {2025})
+    assert hints.get(PROGRAM['program_id'], YEARS) == 2025
+
+    assert scrape(monkeypatch, hints, {2026, 2025}) == [2025]
+
+
+def test_expired_hint_probes_every_year(monkeypatch, tmp_path):
+    hints = YearHints(str(tmp_path / 'hints.json'), ttl=60)
+    hints.set(PROGRAM['program_id'], 2025, YEARS)
+    hints._hints[str(PROGRAM['program_id'])]['checked_at'] = time.time() - 120
+
+    assert 2026 in scrape(monkeypatch, hints, {2026, 2025})
+    assert hints.get(PROGRAM['program_id'], YEARS) == 2026
+
+
+def test_new_year_list_drops_hint(tmp_path):
+    hints = YearHints(str(tmp_path / 'hints.json'))
+    hints.set(PROGRAM['program_id'], 2025, YEARS)
+    assert hints.get(PROGRAM['program_id'], [2027] + YEARS) is None
+
+
+def test_invalid_hinted_year_falls_back_to_other_years(monkeypatch, tmp_path):
+    hints = YearHints(str(tmp_path / 'hints.json'))
+    hints.set(PROGRAM['program_id'], 2025, YEARS)
+    assert scrape(monkeypatch, hints, {2024}) == YEARS
+    assert hints.get(PROGRAM['program_id'], YEARS) == 2024
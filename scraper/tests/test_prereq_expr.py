@@ -0,0 +1,36 @@
+import pytest
+
+from prereq_expr import EQUIVALENT, evaluate, parse_prerequisites, required_codes
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("MATH1051 or equivalent", ['or', 'MATH1051', EQUIVALENT]),
+    ("MATH1051 (or equivalent)", ['or', 'MATH1051', EQUIVALENT]),
+    ("MATH1051 and MATH1052 (or MATH1071)", ['and', 'MATH1051', ['or', 'MATH1052', 'MATH1071']]),
+    ("(MATH1051 or MATH1071) and (CSSE1001 or ENGG1001)",
+     ['and', ['or', 'MATH1051', 'MATH1071'], ['or', 'CSSE1001', 'ENGG1001']]),
+    ("[CSSE1001 and (MATH1051 or MATH1071)] or ENGG1001",
+     ['or', ['and', 'CSSE1001', ['or', 'MATH1051', 'MATH1071']], 'ENGG1001']),
+    ("CSSE1001 and CSSE2002 or ENGG1001", ['or', ['and', 'CSSE1001', 'CSSE2002'], 'ENGG1001']),
+    ("CSSE2002 + CSSE2010; or equivalent", ['or', ['and', 'CSSE2002', 'CSSE2010'], EQUIVALENT]),
+    ("CSSE1001, MATH1061", ['and', 'CSSE1001', 'MATH1061']),
+    ("csse1001", 'CSSE1001'),
+    ("Permission of Head of School", None),
+    ("or equivalent", None),
+    ("N/A", None),
+])
+def test_parse(text, expected):
+    assert parse_prerequisites(text) == expected
+
+
+@pytest.mark.parametrize("text", ["MATH1051 or equivalent", "MATH1051 (or equivalent)"])
+def test_or_equivalent_is_met_by_the_named_course(text):
+    tree = parse_prerequisites(text)
+    assert evaluate(tree, {'MATH1051'})
+    assert not evaluate(tree, set())
+    assert evaluate(tree, set(), allow_equivalent=True)
+
+
+def test_required_codes_drop_alternatives():
+    tree = parse_prerequisites("CSSE1001 and (MATH1051 or MATH1071)")
+    assert required_codes(tree) == {'CSSE1001'}
@@ -0,0 +1,32 @@
+import run_scraper
+from async_crawler import CourseCrawler
+from retry import FATAL, RETRYABLE, FetchError
+
+ECP_LINK = 'https://course-profile.uq.edu.au/course-profiles/AAAA1000-1'
+
+
+def scrape_course(code):
+    return {'code': code, 'ecp_link': ECP_LINK}
+
+
+def crawl(monkeypatch, profile_error):
+    def fetch_page(url, headers=None):
+        raise FetchError(url, profile_error, 403 if profile_error == FATAL else 503)
+
+    monkeypatch.setattr(run_scraper, 'fetch_page', fetch_page)
+    results = []
+    CourseCrawler(scrape_course, run_scraper.scrape_assessment_table).run(
+        ['AAAA1000'], lambda *result: results.append(result))
+    return results
+
+
+def test_unfetchable_profile_keeps_course(monkeypatch):
+    [(code, data, error)] = crawl(monkeypatch, FATAL)
+    assert (code, error) == ('AAAA1000', None)
+    assert data['assessments'] == []
+
+
+def test_transient_profile_failure_fails_course(monkeypatch):
+    [(code, data, error)] = crawl(monkeypatch, RETRYABLE)
+    assert data is None
+    assert isinstance(error, FetchError) and error.retryable
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from search_index import MIN_GRAM_MATCH, SearchIndex, query_grams
+
+WORDS = ['data', 'machine', 'learning', 'quantum', 'mechanics', 'software', 'design', 'law', 'history', 'art']
+
+
+def make_index(count=300, seed=7):
+    rng = random.Random(seed)
+    records = [{'code': f"TEST{i:04d}", 'title': ' '.join(rng.sample(WORDS, 3)), 'description': ''}
+               for i in range(count)]
+    return SearchIndex.build(records)
+
+
+def brute_force_matches(postings, grams):
+    needed = max(1, int(len(grams) * MIN_GRAM_MATCH + 0.999))
+    counts = {}
+    for gram in grams:
+        for doc_id in postings.get(gram, ()):
+            counts[doc_id] = counts.get(doc_id, 0) + 1
+    return {doc_id: count for doc_id, count in counts.items() if count >= needed}
+
+
+@pytest.mark.parametrize('query', ['machine learn', 'quantm mechanics', 'data', 'sof', 'history of art', 'zzz'])
+def test_gram_matches_agree_with_counting_every_posting(query):
+    index = make_index()
+    grams = query_grams(query)
+    assert index._gram_matches(index.title_postings, grams) == brute_force_matches(index.title_postings, grams)
+
+
+def test_search_ranks_codes_then_titles():
+    index = make_index()
+    assert index.search('TEST0001', limit=1)[0]['code'] == 'TEST0001'
+    assert all('quantum' in result['title'] for result in index.search('quantum', limit=5))
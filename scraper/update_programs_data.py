@@ -1,56 +1,30 @@
+import argparse
 import json
 import os
-import requests
-import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
+import sys
 
-# Supabase Credentials
-from dotenv import load_dotenv
+# Reuse the bulk PostgREST client from the database folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database'))
+from postgrest import DEFAULT_BATCH_SIZE, bulk_upsert, fetch_column_map, get_credentials
 
-# Load .env from root directory (parent of scraper folder)
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
-
-# Supabase Credentials
-SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("❌ Error: Missing SUPABASE_URL or SUPABASE_KEY/SUPABASE_SERVICE_ROLE_KEY in .env file")
-    exit(1)
-
-headers = {
-    "apikey": SUPABASE_KEY,
-    "Authorization": f"Bearer {SUPABASE_KEY}",
-    "Content-Type": "application/json",
-    "Prefer": "return=minimal"
-}
-
-def update_single_program(item):
-    program_name, info = item
-    
-    # URL encode the program name
-    encoded_name = urllib.parse.quote(program_name)
-    url = f"{SUPABASE_URL}/rest/v1/programs?name=eq.{encoded_name}"
-    
-    payload = {
+def build_program_row(program_id, program_name, info):
+    return {
+        "id": program_id,
+        "name": program_name,
         "courses": info.get("courses", []),
         "total_units": info.get("total_units", 0),
         "faculty": info.get("department") # Mapping department (json) -> faculty (db)
     }
-    
-    try:
-        response = requests.patch(url, json=payload, headers=headers)
-        if response.status_code in [200, 204]:
-            print(f"✅ Updated: {program_name}")
-            return True
-        else:
-            print(f"❌ Failed ({response.status_code}): {program_name}")
-            return False
-    except Exception as e:
-        print(f"⚠️ Error {program_name}: {e}")
-        return False
 
-def main():
+def main(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Updates every program in programs2.json that already exists in the programs table.
+
+    Names are resolved to program ids and the rows are upserted on id, in
+    batches of `batch_size`, so the whole sync takes a few requests instead of
+    one PATCH per program.  Names missing from the table are reported and
+    skipped, so the upsert only ever updates.
+    """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(script_dir, '..', 'data', 'programs2.json')
     
@@ -61,15 +35,23 @@ def main():
     with open(data_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
         
-    print(f"🚀 Starting update for {len(data)} programs...")
-    
-    items = list(data.items())
-            
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(update_single_program, items))
-        
-    success_count = sum(results)
-    print(f"\n🎉 Finished! Updated {success_count}/{len(items)} programs.")
+    url, key = get_credentials()
+    existing = fetch_column_map("programs", "name", "id", url=url, key=key)
+    missing = [program_name for program_name in data if program_name not in existing]
+
+    rows = [build_program_row(existing[program_name], program_name, info)
+            for program_name, info in data.items() if program_name in existing]
+    print(f"🚀 Starting update for {len(rows)} programs in batches of {batch_size}...")
+    if missing:
+        print(f"⚠️ Skipping {len(missing)} programs not in the programs table (e.g. {missing[0]})")
+
+    written, errors = bulk_upsert("programs", rows, on_conflict="id", batch_size=batch_size, url=url, key=key)
+
+    for start, message in errors:
+        print(f"❌ Failed batch starting at program {start}: {message}")
+    print(f"\n🎉 Finished! Updated {written}/{len(rows)} programs.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Update existing programs in Supabase from programs2.json")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Programs per request")
+    main(parser.parse_args().batch_size)